@@ -0,0 +1,227 @@
+import os
+import json
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .audio_generator import audio_generator, AudioGenerator, TTS_MAX_PARALLEL_REQUESTS
+from .disk_cache import make_cache_key
+from .template_translation import PLACEHOLDER_PATTERN
+
+# Clips of placeholder values (train numbers, platforms, station names), kept until removed
+AUDIO_VALUE_LIBRARY_DIR = os.getenv("AUDIO_VALUE_LIBRARY_DIR", "static/audio_values")
+
+# Numbers up to this are pre-rendered whole; longer numbers such as train numbers are read digit by digit
+AUDIO_LIBRARY_MAX_NUMBER = int(os.getenv("AUDIO_LIBRARY_MAX_NUMBER", "300"))
+
+def number_vocabulary(max_number: int = AUDIO_LIBRARY_MAX_NUMBER) -> List[str]:
+    """Return every number spoken as a whole word, which includes the digits"""
+    return [str(number) for number in range(max_number + 1)]
+
+def spoken_value_parts(value: str) -> List[str]:
+    """Split a placeholder value into the library clips it is spoken with"""
+    if value.isascii() and value.isdigit() and int(value) > AUDIO_LIBRARY_MAX_NUMBER:
+        return list(value)
+    return [value]
+
+def split_template(template_text: str) -> List[Tuple[str, str]]:
+    """Split a template into ('text', fragment) and ('slot', placeholder name) parts.
+
+    Fragments without any letters or digits (bare punctuation and spaces
+    between placeholders) are dropped since there is nothing to speak.
+    """
+    parts = []
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(template_text):
+        fragment = template_text[position:match.start()]
+        if any(char.isalnum() for char in fragment):
+            parts.append(('text', fragment.strip()))
+        parts.append(('slot', match.group(1)))
+        position = match.end()
+    fragment = template_text[position:]
+    if any(char.isalnum() for char in fragment):
+        parts.append(('text', fragment.strip()))
+    return parts
+
+class ValueClipLibrary:
+    """Per-language clips of spoken placeholder values, synthesized once and kept on disk.
+
+    Unlike the TTS cache this library is never evicted, so the small vocabulary
+    of numbers and station names stays available however much other audio is
+    synthesized.
+    """
+
+    def __init__(self, generator: AudioGenerator, directory: str = AUDIO_VALUE_LIBRARY_DIR):
+        self.generator = generator
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self.hits = 0
+        self.misses = 0
+        self._index: Optional[Dict[str, Dict[str, str]]] = None
+        self._lock = threading.Lock()
+
+    def _load_index(self) -> Dict[str, Dict[str, str]]:
+        """Load the language -> value -> clip file index on first use"""
+        if self._index is None:
+            try:
+                with open(self.index_path) as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self._index, f, ensure_ascii=False)
+        os.replace(temp_path, self.index_path)
+
+    def _record(self, value: str, language: str, save: bool = True):
+        with self._lock:
+            self._load_index().setdefault(language, {})[value] = os.path.basename(self.clip_path(value, language))
+            if save:
+                self._save_index()
+
+    def clip_path(self, value: str, language: str) -> str:
+        """Return where the clip of a value in a language is stored"""
+        key = make_cache_key(
+            value, self.generator.voices.get(language, self.generator.voices['en']),
+            self.generator.speaking_rate, self.generator.pitch, self.generator.audio_encoding.name
+        )
+        return os.path.join(self.directory, language, f"{key[:32]}.mp3")
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def has_clip(self, value: str, language: str) -> bool:
+        return os.path.exists(self.clip_path(value, language))
+
+    def get(self, value: str, language: str, save_index: bool = True) -> bytes:
+        """Return the clip of a value, synthesizing and storing it on first use"""
+        path = self.clip_path(value, language)
+        try:
+            with open(path, 'rb') as f:
+                audio_content = f.read()
+            self._count(True)
+            return audio_content
+        except FileNotFoundError:
+            pass
+
+        self._count(False)
+        # The library is the clip's only copy; caching it too would evict sentence audio
+        audio_content = self.generator.generate_audio(value, language, use_cache=False)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(audio_content)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+        self._record(value, language, save=save_index)
+        return audio_content
+
+    def prerender(
+        self,
+        values: Iterable[str],
+        languages: Iterable[str],
+        progress: Optional[Callable[[int, str], None]] = None
+    ) -> Dict[str, int]:
+        """Synthesize every value in every language, skipping clips already on disk"""
+        values = list(dict.fromkeys(value.strip() for value in values if value and value.strip()))
+        pending = []
+        stats = {'rendered': 0, 'existing': 0, 'failed': 0}
+        for language in languages:
+            for value in values:
+                if self.has_clip(value, language):
+                    self._record(value, language, save=False)
+                    stats['existing'] += 1
+                else:
+                    pending.append((value, language))
+        print(f"🔄 Pre-rendering {len(pending)} value clips ({stats['existing']} already in the library)")
+
+        def render(item):
+            value, language = item
+            try:
+                self.get(value, language, save_index=False)
+                return True
+            except Exception as e:
+                print(f"❌ Failed to render '{value}' ({language}): {e}")
+                return False
+
+        last_percent = -1
+        max_workers = max(1, min(len(pending), TTS_MAX_PARALLEL_REQUESTS))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts") as executor:
+            for done, success in enumerate(executor.map(render, pending), start=1):
+                stats['rendered' if success else 'failed'] += 1
+                percent = int(done * 100 / len(pending))
+                if progress and percent != last_percent:
+                    last_percent = percent
+                    progress(percent, f"Rendered {done}/{len(pending)} value clips")
+
+        with self._lock:
+            self._load_index()
+            self._save_index()
+        print(f"✅ Value clip library: {stats['rendered']} rendered, {stats['existing']} existing, {stats['failed']} failed")
+        return stats
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters of value clip lookups and clips per language"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "clips": {language: len(clips) for language, clips in self._load_index().items()},
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0
+            }
+
+class SegmentedAnnouncementAudio:
+    """Assemble announcement audio from cached template fragments and value clips"""
+
+    def __init__(self, generator: AudioGenerator, value_library: ValueClipLibrary):
+        self.generator = generator
+        self.value_library = value_library
+
+    def plan(self, skeletons: Dict[str, str], values: Dict) -> List[Tuple[str, str, str]]:
+        """List the (kind, text, language) clips that make up the announcement, in order.
+
+        ``skeletons`` maps language codes to template text in that language, in
+        the order the languages should be spoken.
+        """
+        clips = []
+        for language, skeleton in skeletons.items():
+            for kind, text in split_template(skeleton):
+                if kind == 'slot':
+                    value = values.get(text)
+                    if value is None or not str(value).strip():
+                        continue
+                    for part in spoken_value_parts(str(value).strip()):
+                        clips.append(('value', part, language))
+                else:
+                    clips.append(('text', text, language))
+        return clips
+
+    def _synthesize(self, clip: Tuple[str, str, str]) -> bytes:
+        kind, text, language = clip
+        if kind == 'value':
+            return self.value_library.get(text, language)
+        # Static fragments repeat across every announcement of a template, so the TTS cache serves them
+        return self.generator.generate_audio(text, language)
+
+    def render_segments(self, skeletons: Dict[str, str], values: Dict) -> List[bytes]:
+        """Return the MP3 clips of an announcement, synthesizing only uncached ones"""
+        clips = self.plan(skeletons, values)
+        if not clips:
+            return []
+        max_workers = max(1, min(len(clips), TTS_MAX_PARALLEL_REQUESTS))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts") as executor:
+            return list(executor.map(self._synthesize, clips))
+
+# Global instances
+value_clip_library = ValueClipLibrary(audio_generator)
+segmented_audio = SegmentedAnnouncementAudio(audio_generator, value_clip_library)
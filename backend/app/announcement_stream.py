@@ -0,0 +1,127 @@
+import os
+import asyncio
+import threading
+from typing import AsyncIterator, Dict, Iterable, Optional, Set, Tuple
+
+# Server-Sent Events configuration
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))  # Idle time before a heartbeat comment is sent
+SSE_BUFFER_SIZE = int(os.getenv("SSE_BUFFER_SIZE", "100"))  # Events queued per subscriber before it is dropped
+SSE_REPLAY_LIMIT = int(os.getenv("SSE_REPLAY_LIMIT", "100"))  # Missed announcements replayed on reconnect
+SSE_RETRY_MS = int(os.getenv("SSE_RETRY_MS", "3000"))  # Reconnect delay suggested to clients
+
+# Channel that receives the announcements of every station
+ALL_STATIONS = "ALL"
+
+# Queued in place of an event when a subscriber falls too far behind
+OVERFLOW = None
+
+def channel_for(station_code: str) -> str:
+    """Station codes are case-insensitive, as in the train lookups"""
+    return station_code.strip().upper()
+
+def format_event(event_id: int, data: str, event: str = "announcement") -> str:
+    """Encode one SSE event; data must not contain newlines (compact JSON doesn't)"""
+    return f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+
+class Subscriber:
+    def __init__(self, channel: str, buffer_size: int):
+        self.channel = channel
+        self.queue: "asyncio.Queue[Optional[Tuple[int, str]]]" = asyncio.Queue(maxsize=buffer_size + 1)
+        self.buffer_size = buffer_size
+        self.overflowed = False
+
+    def offer(self, event: Tuple[int, str]):
+        if self.overflowed:
+            return
+        if self.queue.qsize() >= self.buffer_size:
+            # Disconnect rather than block the publisher or silently drop events;
+            # the client reconnects with Last-Event-ID and catches up from the database
+            self.overflowed = True
+            self.queue.put_nowait(OVERFLOW)
+            return
+        self.queue.put_nowait(event)
+
+class AnnouncementBus:
+    """In-process pub/sub of generated announcements, one channel per station code.
+
+    Publishing and subscribing happen on the event loop. Subscribers of the
+    ALL channel receive every station's announcements.
+    """
+
+    def __init__(self, buffer_size: int = SSE_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self.published = 0
+        self.dropped = 0
+        self._channels: Dict[str, Set[Subscriber]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, station_code: str) -> Subscriber:
+        subscriber = Subscriber(channel_for(station_code), self.buffer_size)
+        with self._lock:
+            self._channels.setdefault(subscriber.channel, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            subscribers = self._channels.get(subscriber.channel)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._channels[subscriber.channel]
+
+    def publish(self, station_code: Optional[str], event_id: int, data: str):
+        """Deliver an event to subscribers of its station and of the ALL channel"""
+        channels = {ALL_STATIONS} if station_code is None else {channel_for(station_code), ALL_STATIONS}
+        with self._lock:
+            subscribers = [subscriber for channel in channels for subscriber in self._channels.get(channel, ())]
+            self.published += 1
+        for subscriber in subscribers:
+            was_overflowed = subscriber.overflowed
+            subscriber.offer((event_id, data))
+            if subscriber.overflowed and not was_overflowed:
+                self.dropped += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "channels": len(self._channels),
+                "subscribers": sum(len(subscribers) for subscribers in self._channels.values()),
+                "published": self.published,
+                "dropped_subscribers": self.dropped
+            }
+
+async def stream_events(
+    bus: AnnouncementBus,
+    subscriber: Subscriber,
+    replay: Iterable[Tuple[int, str]],
+    heartbeat_seconds: float = SSE_HEARTBEAT_SECONDS
+) -> AsyncIterator[str]:
+    """Yield replayed events, then live ones, with heartbeats while idle.
+
+    The subscriber must be registered before the replay is read, so nothing
+    published in between is lost; events already replayed are skipped.
+    """
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        replayed = set()
+        for event_id, data in replay:
+            replayed.add(event_id)
+            yield format_event(event_id, data)
+
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if event is OVERFLOW:
+                break
+            event_id, data = event
+            if event_id in replayed:
+                continue
+            yield format_event(event_id, data)
+    finally:
+        bus.unsubscribe(subscriber)
+
+# Global instance
+announcement_bus = AnnouncementBus()
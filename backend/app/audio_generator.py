@@ -1,16 +1,34 @@
 import os
-import tempfile
-import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 from google.cloud import texttospeech
 import logging
+from .disk_cache import DiskLRUCache, make_cache_key
+from .mp3_utils import concat_mp3
 
 logger = logging.getLogger(__name__)
 
+# Synthesized audio cache configuration
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "static/tts_cache")
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+# Upper bound on concurrent TTS requests for one multi-language announcement
+TTS_MAX_PARALLEL_REQUESTS = int(os.getenv("TTS_MAX_PARALLEL_REQUESTS", "4"))
+
 class AudioGenerator:
     def __init__(self):
         self.client = None
         self._initialized = False
+        self._init_lock = threading.Lock()
+        
+        # Synthesis parameters shared by every request
+        self.speaking_rate = 0.9  # Previous speech rate
+        self.pitch = 0.0
+        self.audio_encoding = texttospeech.AudioEncoding.MP3
+        
+        # Content-addressed cache of synthesized audio
+        self.cache = DiskLRUCache(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES, suffix=".mp3")
         
         # Voice configurations for Indian languages
         self.voices = {
@@ -61,15 +79,29 @@ class AudioGenerator:
                 logger.error(f"Failed to initialize Google Cloud TTS client: {e}")
                 raise RuntimeError("Google Cloud TTS client initialization failed. Please check your credentials.")
 
-    def generate_audio(self, text: str, language: str) -> bytes:
-        """Generate audio for a single text in specified language"""
+    def generate_audio(self, text: str, language: str, use_cache: bool = True) -> bytes:
+        """Generate audio for a single text in specified language.
+
+        Pass ``use_cache=False`` for audio stored elsewhere, so it doesn't take up TTS cache space.
+        """
         try:
-            self._initialize_client()
-            
             # Get voice and language code
             voice_name = self.voices.get(language, self.voices['en'])
             language_code = self.language_codes.get(language, 'en-IN')
             
+            # Serve repeated announcements from the cache
+            cache_key = make_cache_key(
+                text, language_code, voice_name,
+                self.speaking_rate, self.pitch, self.audio_encoding.name
+            )
+            cached_audio = self.cache.get(cache_key) if use_cache else None
+            if cached_audio is not None:
+                return cached_audio
+            
+            # Worker threads may race to create the shared client on a cold start
+            with self._init_lock:
+                self._initialize_client()
+            
             # Create synthesis input
             synthesis_input = texttospeech.SynthesisInput(text=text)
             
@@ -81,9 +113,9 @@ class AudioGenerator:
             
             # Configure audio
             audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3,
-                speaking_rate=0.9,  # Previous speech rate
-                pitch=0.0
+                audio_encoding=self.audio_encoding,
+                speaking_rate=self.speaking_rate,
+                pitch=self.pitch
             )
             
             # Perform text-to-speech request
@@ -93,58 +125,36 @@ class AudioGenerator:
                 audio_config=audio_config
             )
             
+            if use_cache:
+                self.cache.put(cache_key, response.audio_content)
             return response.audio_content
             
         except Exception as e:
             logger.error(f"Error generating audio for language {language}: {str(e)}")
             raise
 
+    def synthesize_segments(self, announcements: Dict[str, str]) -> List[bytes]:
+        """Synthesize each language concurrently, preserving announcement order"""
+        segments = [(lang, text) for lang, text in announcements.items() if text and text.strip()]
+        if not segments:
+            return []
+        
+        max_workers = max(1, min(len(segments), TTS_MAX_PARALLEL_REQUESTS))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts") as executor:
+            futures = [executor.submit(self.generate_audio, text, lang) for lang, text in segments]
+            return [future.result() for future in futures]
+
     def generate_multi_language_audio(self, announcements: Dict[str, str]) -> bytes:
         """Generate multi-language audio announcement"""
         try:
-            # Create temporary directory for audio files
-            with tempfile.TemporaryDirectory() as temp_dir:
-                audio_files = []
-                
-                # Generate audio for each language
-                for lang, text in announcements.items():
-                    if text and text.strip():
-                        audio_content = self.generate_audio(text, lang)
-                        
-                        # Save to temporary file
-                        audio_file = os.path.join(temp_dir, f"{lang}.mp3")
-                        with open(audio_file, 'wb') as f:
-                            f.write(audio_content)
-                        audio_files.append(audio_file)
-                
-                if not audio_files:
-                    raise ValueError("No valid announcements provided")
-                
-                # Create concat file for ffmpeg
-                concat_file = os.path.join(temp_dir, "concat.txt")
-                with open(concat_file, 'w') as f:
-                    for audio_file in audio_files:
-                        f.write(f"file '{audio_file}'\n")
-                
-                # Output file
-                output_file = os.path.join(temp_dir, "combined.mp3")
-                
-                # Use ffmpeg to concatenate audio files
-                cmd = [
-                    'ffmpeg', '-f', 'concat', '-safe', '0',
-                    '-i', concat_file, '-c', 'copy', output_file,
-                    '-y'  # Overwrite output file
-                ]
-                
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                
-                if result.returncode != 0:
-                    logger.error(f"FFmpeg error: {result.stderr}")
-                    raise RuntimeError(f"Failed to combine audio files: {result.stderr}")
-                
-                # Read the combined audio file
-                with open(output_file, 'rb') as f:
-                    return f.read()
+            # Generate audio for each language in parallel
+            segments = self.synthesize_segments(announcements)
+            
+            if not segments:
+                raise ValueError("No valid announcements provided")
+            
+            # All segments share one encoder configuration, so join their MP3 frames directly
+            return concat_mp3(segments)
                     
         except Exception as e:
             logger.error(f"Error generating multi-language audio: {str(e)}")
@@ -154,5 +164,9 @@ class AudioGenerator:
         """Get list of supported language codes"""
         return list(self.voices.keys())
 
+    def get_cache_stats(self) -> Dict[str, float]:
+        """Get hit/miss counters for the synthesized audio cache"""
+        return self.cache.stats()
+
 # Global instance
 audio_generator = AudioGenerator() 
\ No newline at end of file
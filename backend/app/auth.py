@@ -1,23 +1,45 @@
-from datetime import datetime, timedelta
-from typing import Optional
+import os
+import hmac
+import time
+import hashlib
+import secrets
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from . import models, schemas
-from .database import get_db
+from . import models, schemas, executors
+from .database import get_db, get_async_db
 
 # Security configuration
 SECRET_KEY = "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+
+# Device tokens for station display screens: dev_<prefix>_<secret>
+DEVICE_TOKEN_PREFIX = "dev_"
+DEVICE_ROLE = "device"
+DEVICE_TOKEN_HASH_KEY = os.getenv("DEVICE_TOKEN_HASH_KEY", SECRET_KEY).encode()  # HMAC key for stored secrets
+DEVICE_TOKEN_TOUCH_SECONDS = int(os.getenv("DEVICE_TOKEN_TOUCH_SECONDS", "300"))  # How often last_used_at is updated
+
+# Authenticated user caching
+AUTH_USER_CACHE_TTL_SECONDS = int(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "30"))  # 0 disables the cache
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "4096"))  # Entries kept per cache
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # JWT token security
 security = HTTPBearer()
+# For endpoints that also accept the token as a query parameter
+optional_security = HTTPBearer(auto_error=False)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -25,6 +47,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the password pool, for use inside async endpoints"""
+    return await executors.run_password(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the password pool, for use inside async endpoints"""
+    return await executors.run_password(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -35,34 +65,211 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_refresh_token(db: Session, user: models.User) -> str:
+    """Create a long-lived token that can only be exchanged for new access tokens.
+
+    Its id is recorded in refresh_tokens, so it can be used once and revoked.
+    """
+    jti = secrets.token_urlsafe(16)
+    expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    db.add(models.RefreshToken(jti=jti, user_id=user.id, expires_at=expire))
+    db.commit()
+    return jwt.encode({"sub": user.email, "type": "refresh", "jti": jti, "exp": expire}, SECRET_KEY, algorithm=ALGORITHM)
+
+def verify_refresh_token(token: str) -> Optional[Tuple[str, str]]:
+    """Return (email, token id) of a well-formed refresh token, without checking revocation"""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("type") != "refresh" or not payload.get("sub") or not payload.get("jti"):
+        return None
+    return payload["sub"], payload["jti"]
+
+def revoke_refresh_tokens(db: Session, user_id: int):
+    """Revoke every outstanding refresh token of a user; the caller commits"""
+    db.query(models.RefreshToken).filter(
+        models.RefreshToken.user_id == user_id,
+        models.RefreshToken.revoked_at.is_(None)
+    ).update({"revoked_at": datetime.utcnow()}, synchronize_session=False)
+
+def consume_refresh_token(db: Session, token: str) -> Optional[models.User]:
+    """Revoke a refresh token and return its active user, or None if it can't be used.
+
+    Each token is exchanged once. Presenting a token that was already rotated
+    means it was copied, so every refresh token of the user is revoked.
+    """
+    claims = verify_refresh_token(token)
+    if claims is None:
+        return None
+    email, jti = claims
+    record = db.query(models.RefreshToken).filter(models.RefreshToken.jti == jti).first()
+    user = db.query(models.User).filter(models.User.email == email).first()
+    if record is None or user is None or record.user_id != user.id:
+        return None
+    if record.revoked_at is not None:
+        revoke_refresh_tokens(db, user.id)
+        db.commit()
+        return None
+
+    # Conditional on not being revoked yet, so concurrent refreshes can't both use it
+    now = datetime.utcnow()
+    used = db.query(models.RefreshToken).filter(
+        models.RefreshToken.id == record.id,
+        models.RefreshToken.revoked_at.is_(None),
+        models.RefreshToken.expires_at > now
+    ).update({"revoked_at": now}, synchronize_session=False)
+    # Drop the user's tokens that have expired anyway
+    db.query(models.RefreshToken).filter(
+        models.RefreshToken.user_id == user.id,
+        models.RefreshToken.expires_at <= now
+    ).delete(synchronize_session=False)
+    db.commit()
+    if not used or not user.is_active:
+        return None
+    return user
+
+class TokenCache:
+    """Memoized token decodes: token string -> (subject, expiry as time.time()).
+
+    Only valid tokens are remembered, and an entry stops matching once the
+    token's own expiry has passed.
+    """
+
+    def __init__(self, max_entries: int = AUTH_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return entry[0]
+
+    def put(self, token: str, subject: str, expires_at: float):
+        with self._lock:
+            self._entries[token] = (subject, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+class UserCache:
+    """Short-lived snapshots of authenticated users, keyed by email (the token subject).
+
+    Snapshots are plain column values; every lookup returns a new transient
+    models.User, so requests never share ORM state. Entries must be
+    invalidated whenever a user is created, deleted or has its role changed.
+    """
+
+    def __init__(self, ttl_seconds: int = AUTH_USER_CACHE_TTL_SECONDS, max_entries: int = AUTH_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, email: str) -> Optional[models.User]:
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._entries[email]
+                return None
+            self._entries.move_to_end(email)
+            values = entry[0]
+        return models.User(**values)
+
+    def put(self, user: models.User):
+        if self.ttl_seconds <= 0:
+            return
+        values = {column.key: getattr(user, column.key) for column in models.User.__table__.columns}
+        with self._lock:
+            self._entries[user.email] = (values, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(user.email)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, email: Optional[str] = None):
+        """Forget one user, or every user if no email is given"""
+        with self._lock:
+            if email is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(email, None)
+
+token_cache = TokenCache()
+user_cache = UserCache()
+
+def invalidate_cached_user(email: Optional[str] = None):
+    """Drop cached snapshots after a user is added, removed or changes role"""
+    user_cache.invalidate(email)
+
 def verify_token(token: str) -> Optional[str]:
+    email = token_cache.get(token)
+    if email is not None:
+        return email
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
-        if email is None:
+        # Refresh tokens are only accepted by /auth/refresh
+        if email is None or payload.get("type") == "refresh":
             return None
+        token_cache.put(token, email, payload.get("exp", float("inf")))
         return email
     except JWTError:
         return None
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> models.User:
-    credentials_exception = HTTPException(
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> models.User:
     email = verify_token(credentials.credentials)
     if email is None:
-        raise credentials_exception
+        raise credentials_exception()
+    
+    user = user_cache.get(email)
+    if user is not None:
+        return user
     
     user = db.query(models.User).filter(models.User.email == email).first()
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
     
+    user_cache.put(user)
+    return user
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> models.User:
+    """Same as get_current_user, for endpoints on the async session path"""
+    email = verify_token(credentials.credentials)
+    if email is None:
+        raise credentials_exception()
+    
+    user = user_cache.get(email)
+    if user is not None:
+        return user
+    
+    result = await db.execute(select(models.User).filter(models.User.email == email))
+    user = result.scalars().first()
+    if user is None:
+        raise credentials_exception()
+    
+    user_cache.put(user)
     return user
 
 def authenticate_user(db: Session, email: str, password: str) -> Optional[models.User]:
@@ -71,4 +278,106 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[models
         return None
     if not verify_password(password, user.hashed_password):
         return None
-    return user 
\ No newline at end of file
+    return user 
+
+async def authenticate_user_async(db: Session, email: str, password: str) -> Optional[models.User]:
+    """Same as authenticate_user, with the bcrypt check run off the event loop"""
+    user = db.query(models.User).filter(models.User.email == email).first()
+    if not user:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    return user
+
+def hash_device_secret(secret: str) -> str:
+    return hmac.new(DEVICE_TOKEN_HASH_KEY, secret.encode(), hashlib.sha256).hexdigest()
+
+def generate_device_token() -> Tuple[str, str, str]:
+    """Return a new device token with its lookup prefix and the hash to store"""
+    prefix = secrets.token_hex(6)
+    secret = secrets.token_urlsafe(32)
+    return f"{DEVICE_TOKEN_PREFIX}{prefix}_{secret}", prefix, hash_device_secret(secret)
+
+def split_device_token(token: str) -> Optional[Tuple[str, str]]:
+    """Split a device token into (prefix, secret), or None if it isn't one"""
+    if not token.startswith(DEVICE_TOKEN_PREFIX):
+        return None
+    prefix, _, secret = token[len(DEVICE_TOKEN_PREFIX):].partition("_")
+    if not prefix or not secret:
+        return None
+    return prefix, secret
+
+def check_device_secret(device: Optional[models.DeviceToken], secret: str) -> bool:
+    if device is None or not device.is_active or device.revoked_at is not None:
+        return False
+    return hmac.compare_digest(device.token_hash, hash_device_secret(secret))
+
+def device_needs_touch(device: models.DeviceToken) -> bool:
+    """Whether last_used_at is old enough to be worth a write"""
+    if device.last_used_at is None:
+        return True
+    last_used_at = device.last_used_at
+    if last_used_at.tzinfo is not None:
+        last_used_at = last_used_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return (datetime.utcnow() - last_used_at).total_seconds() >= DEVICE_TOKEN_TOUCH_SECONDS
+
+def device_principal(device: models.DeviceToken) -> models.User:
+    """Represent a device as a transient user limited to its station's announcements"""
+    return models.User(
+        email=f"device:{device.token_prefix}",
+        username=device.name,
+        role=DEVICE_ROLE,
+        station_code=device.station_code,
+        is_active=True
+    )
+
+def get_current_user_or_device(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> models.User:
+    """get_current_user that also accepts device tokens, for display-facing read endpoints"""
+    parts = split_device_token(credentials.credentials)
+    if parts is None:
+        return get_current_user(credentials, db)
+    
+    prefix, secret = parts
+    device = db.query(models.DeviceToken).filter(models.DeviceToken.token_prefix == prefix).first()
+    if not check_device_secret(device, secret):
+        raise credentials_exception()
+    
+    if device_needs_touch(device):
+        device.last_used_at = datetime.utcnow()
+        db.commit()
+    return device_principal(device)
+
+async def get_current_user_or_device_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> models.User:
+    """Same as get_current_user_or_device, for endpoints on the async session path"""
+    parts = split_device_token(credentials.credentials)
+    if parts is None:
+        return await get_current_user_async(credentials, db)
+    
+    prefix, secret = parts
+    result = await db.execute(select(models.DeviceToken).filter(models.DeviceToken.token_prefix == prefix))
+    device = result.scalars().first()
+    if not check_device_secret(device, secret):
+        raise credentials_exception()
+    
+    if device_needs_touch(device):
+        device.last_used_at = datetime.utcnow()
+        await db.commit()
+    return device_principal(device)
+
+async def get_current_user_or_device_from_query_async(
+    access_token: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: AsyncSession = Depends(get_async_db)
+) -> models.User:
+    """get_current_user_or_device_async that falls back to ?access_token=, as browser EventSource can't set headers"""
+    if credentials is None:
+        if not access_token:
+            raise credentials_exception()
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=access_token)
+    return await get_current_user_or_device_async(credentials, db)
\ No newline at end of file
@@ -0,0 +1,186 @@
+import os
+import hashlib
+import json
+import shutil
+import tempfile
+import threading
+import logging
+from collections import OrderedDict
+from typing import Optional, Dict
+
+logger = logging.getLogger(__name__)
+
+def make_cache_key(*parts) -> str:
+    """Build a stable content hash from the given key parts"""
+    payload = json.dumps([str(part) for part in parts], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class DiskLRUCache:
+    """Size-bounded, content-addressed file cache with LRU eviction.
+
+    Entries live as individual files named after their key. Recency is tracked
+    in memory and mirrored to the file mtime, so the LRU order survives restarts.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str = ""):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def _load(self):
+        """Rebuild the in-memory LRU index from the cache directory"""
+        if self._loaded:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        for name in os.listdir(self.directory):
+            if self.suffix and not name.endswith(self.suffix):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            key = name[:len(name) - len(self.suffix)] if self.suffix else name
+            found.append((stat.st_mtime, key, stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._loaded = True
+        self._evict()
+
+    def _touch(self, key: str):
+        self._entries.move_to_end(key)
+        try:
+            os.utime(self._path(key), None)
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _forget(self, key: str):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _add(self, key: str, size: int):
+        self._forget(key)
+        self._entries[key] = size
+        self._total_bytes += size
+        self._evict()
+
+    def get_path(self, key: str) -> Optional[str]:
+        """Return the on-disk path of a cached entry, or None on a miss"""
+        with self._lock:
+            self._load()
+            if key in self._entries and os.path.exists(self._path(key)):
+                self.hits += 1
+                self._touch(key)
+                return self._path(key)
+            self._forget(key)
+            self.misses += 1
+            return None
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached bytes for key, or None on a miss"""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError as e:
+            logger.warning(f"Failed to read cache entry {key}: {e}")
+            with self._lock:
+                self._forget(key)
+            return None
+
+    def put(self, key: str, data: bytes):
+        """Store bytes under key, evicting least recently used entries if needed"""
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._load()
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                # mkstemp creates owner-only files; cached entries may be served directly
+                os.chmod(temp_path, 0o644)
+                os.replace(temp_path, self._path(key))
+            except OSError as e:
+                logger.warning(f"Failed to write cache entry {key}: {e}")
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+                return
+            self._add(key, len(data))
+
+    def put_file(self, key: str, source_path: str) -> Optional[str]:
+        """Copy an existing file into the cache and return its cached path"""
+        size = os.path.getsize(source_path)
+        if size > self.max_bytes:
+            return None
+        with self._lock:
+            self._load()
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            os.close(fd)
+            try:
+                shutil.copyfile(source_path, temp_path)
+                os.chmod(temp_path, 0o644)
+                os.replace(temp_path, self._path(key))
+            except OSError as e:
+                logger.warning(f"Failed to store cache entry {key}: {e}")
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+                return None
+            self._add(key, size)
+            return self._path(key)
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            self._load()
+            for key in list(self._entries.keys()):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and current occupancy"""
+        with self._lock:
+            self._load()
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0
+            }
@@ -0,0 +1,125 @@
+import os
+import asyncio
+import functools
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Callable, Dict, Optional
+
+# Worker pool sizes
+MEDIA_WORKERS = int(os.getenv("MEDIA_WORKERS", "8"))
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(os.cpu_count() or 2)))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 2))))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64"))  # Waiting hashes before rejecting
+
+class ExecutorSaturated(Exception):
+    """Raised when a bounded pool already has its maximum of queued work"""
+
+class MonitoredExecutor:
+    """Lazily created worker pool that tracks in-flight work for metrics"""
+
+    def __init__(self, name: str, max_workers: int, use_processes: bool = False, max_queue: Optional[int] = None):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.use_processes = use_processes
+        self.max_queue = max_queue
+        self.rejected = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.use_processes:
+                    # Spawn instead of fork so workers don't inherit gRPC/DB state
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix=self.name
+                    )
+            return self._executor
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """Run func on the pool and await its result"""
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.max_queue is not None and self.in_flight - self.max_workers >= self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturated(f"{self.name} pool is saturated")
+            self.in_flight += 1
+        try:
+            result = await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+            with self._lock:
+                self.completed += 1
+            return result
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def metrics(self) -> Dict[str, float]:
+        """Return queue depth and saturation of the pool"""
+        with self._lock:
+            active = min(self.in_flight, self.max_workers)
+            return {
+                "max_workers": self.max_workers,
+                "active": active,
+                "queue_depth": self.in_flight - active,
+                "saturation": active / self.max_workers,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected
+            }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+# Blocking I/O: Google clients, ffmpeg subprocesses and file writes
+media_pool = MonitoredExecutor("media", MEDIA_WORKERS)
+
+# CPU-bound pure-Python work; callables and arguments must be picklable
+cpu_pool = MonitoredExecutor("cpu", CPU_WORKERS, use_processes=True)
+
+# bcrypt hashing and verification; bcrypt releases the GIL, so threads run in parallel.
+# Kept apart from the media pool so a burst of logins can't starve TTS and ffmpeg work.
+password_pool = MonitoredExecutor("password", PASSWORD_HASH_WORKERS, max_queue=PASSWORD_HASH_MAX_QUEUE)
+
+async def run_media(func: Callable, *args, **kwargs):
+    """Run blocking media work off the event loop"""
+    return await media_pool.run(func, *args, **kwargs)
+
+async def run_cpu(func: Callable, *args, **kwargs):
+    """Run CPU-heavy work in a separate process"""
+    return await cpu_pool.run(func, *args, **kwargs)
+
+async def run_password(func: Callable, *args, **kwargs):
+    """Run password hashing off the event loop; raises ExecutorSaturated when too many are waiting"""
+    return await password_pool.run(func, *args, **kwargs)
+
+def get_metrics() -> Dict[str, Dict[str, float]]:
+    """Return metrics for every worker pool"""
+    return {
+        media_pool.name: media_pool.metrics(),
+        cpu_pool.name: cpu_pool.metrics(),
+        password_pool.name: password_pool.metrics()
+    }
+
+def shutdown():
+    """Stop every worker pool"""
+    media_pool.shutdown()
+    cpu_pool.shutdown()
+    password_pool.shutdown()
@@ -0,0 +1,250 @@
+import os
+import json
+import time
+import threading
+import subprocess
+from typing import Dict, Optional
+
+INDEX_VERSION = 1
+
+# Normalized copies are written next to the original clip with this suffix
+NORMALIZED_SUFFIX = ".normalized.mp4"
+
+# How often lookups re-check the dataset directory for added or removed words
+ISL_INDEX_CHECK_SECONDS = float(os.getenv("ISL_INDEX_CHECK_SECONDS", "60"))
+
+def probe_clip(video_path: str) -> Dict:
+    """Read duration and video codec parameters of a clip with ffprobe.
+
+    Returns an empty dict if ffprobe is unavailable or the clip can't be read.
+    """
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=codec_name,profile,width,height,pix_fmt,r_frame_rate,time_base:format=duration',
+        '-of', 'json',
+        video_path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return {}
+    if result.returncode != 0:
+        return {}
+
+    try:
+        info = json.loads(result.stdout)
+    except ValueError:
+        return {}
+    streams = info.get('streams') or [{}]
+    duration = info.get('format', {}).get('duration')
+    return {
+        'duration': float(duration) if duration else None,
+        'codec': streams[0]
+    }
+
+class ISLDatasetIndex:
+    """Word to clip index of the ISL dataset, persisted as a JSON sidecar.
+
+    The index is loaded on first use. Refreshes compare each word directory's
+    mtime with the stored one, so only changed directories are listed and
+    only new or modified clips are probed. Once every clip has a normalized
+    copy in ``profile_id``, lookups return the normalized copies instead.
+    """
+
+    def __init__(self, dataset_path: str, profile_id: Optional[str] = None):
+        self.dataset_path = dataset_path
+        self.profile_id = profile_id
+        # Kept beside the dataset directory so writing it doesn't change the directory mtime
+        self.index_path = f"{os.path.normpath(dataset_path)}.index.json"
+        self.entries: Dict[str, Dict] = {}
+        self.dataset_mtime = None
+        self._videos: Dict[str, str] = {}
+        self.fully_normalized = False
+        self._loaded = False
+        self._last_check = 0.0
+        self._lock = threading.RLock()
+
+    def _dataset_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.dataset_path).st_mtime
+        except OSError:
+            return None
+
+    def _load_sidecar(self) -> bool:
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get('version') != INDEX_VERSION:
+            return False
+        self.entries = data.get('words', {})
+        self.dataset_mtime = data.get('dataset_mtime')
+        return True
+
+    def _save_sidecar(self):
+        data = {
+            'version': INDEX_VERSION,
+            'dataset_mtime': self.dataset_mtime,
+            'words': self.entries
+        }
+        temp_path = f"{self.index_path}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            print(f"Warning: could not save ISL dataset index: {e}")
+
+    def is_normalized(self, entry: Dict) -> bool:
+        """Check whether an entry has a normalized copy in the current profile"""
+        normalized = entry.get('normalized')
+        return bool(
+            self.profile_id and normalized
+            and normalized.get('profile') == self.profile_id
+            and normalized.get('source_mtime') == entry.get('mtime')
+        )
+
+    def _rebuild_lookup(self):
+        # Concat can only stream-copy when every clip shares one profile, so
+        # normalized copies are used all-or-nothing
+        self.fully_normalized = bool(self.entries) and all(
+            self.is_normalized(entry) for entry in self.entries.values()
+        )
+        if self.fully_normalized:
+            self._videos = {word: entry['normalized']['path'] for word, entry in self.entries.items()}
+        else:
+            self._videos = {word: entry['path'] for word, entry in self.entries.items()}
+
+    def set_normalized(self, word: str, normalized_path: str, source_mtime: float, save: bool = True):
+        """Record a normalized copy of a word's clip.
+
+        Pass ``save=False`` when recording many copies and call save() once afterwards.
+        """
+        with self._lock:
+            entry = self.entries.get(word)
+            if entry is None:
+                return
+            entry['normalized'] = {
+                'path': normalized_path,
+                'profile': self.profile_id,
+                'source_mtime': source_mtime
+            }
+            # Writing the copy changed the word directory
+            entry['dir_mtime'] = os.stat(os.path.dirname(entry['path'])).st_mtime
+            if save:
+                self.save()
+
+    def save(self):
+        """Apply recorded changes to lookups and persist the index"""
+        with self._lock:
+            self._rebuild_lookup()
+            self._save_sidecar()
+
+    def _scan_word_dir(self, word: str, word_path: str, dir_mtime: float, full: bool) -> Optional[Dict]:
+        """Index the clip of one word directory, reusing probe data if unchanged"""
+        # Check for video file in the directory
+        video_file = None
+        for file in sorted(os.listdir(word_path)):
+            if file.endswith('.mp4') and not file.endswith(NORMALIZED_SUFFIX) and not file.startswith('.'):
+                video_file = file
+                break
+        if video_file is None:
+            return None
+
+        video_path = os.path.join(word_path, video_file)
+        clip_mtime = os.stat(video_path).st_mtime
+        previous = self.entries.get(word)
+        entry = {
+            'path': video_path,
+            'mtime': clip_mtime,
+            'dir_mtime': dir_mtime
+        }
+        unchanged = previous and previous.get('path') == video_path and previous.get('mtime') == clip_mtime
+        if unchanged and not full:
+            entry.update({key: value for key, value in previous.items() if key not in entry})
+        else:
+            entry.update(probe_clip(video_path))
+        # A full rescan re-probes the clip but keeps its normalized copy, which is still current
+        normalized = previous.get('normalized') if unchanged else None
+        if normalized and os.path.exists(normalized['path']):
+            entry['normalized'] = normalized
+        return entry
+
+    def refresh(self, full: bool = False) -> Dict[str, int]:
+        """Bring the index up to date with the dataset directory.
+
+        With ``full`` every directory is re-listed and every clip re-probed.
+        """
+        with self._lock:
+            stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+            self._last_check = time.monotonic()
+
+            if not os.path.exists(self.dataset_path):
+                print(f"Warning: ISL dataset path {self.dataset_path} does not exist")
+                stats['removed'] = len(self.entries)
+                self.entries = {}
+                self._rebuild_lookup()
+                self._loaded = True
+                return stats
+
+            current = {}
+            with os.scandir(self.dataset_path) as items:
+                for item in items:
+                    if item.name.startswith('.') or not item.is_dir():
+                        continue
+                    dir_mtime = item.stat().st_mtime
+                    previous = self.entries.get(item.name)
+                    if not full and previous and previous.get('dir_mtime') == dir_mtime:
+                        current[item.name] = previous
+                        stats['unchanged'] += 1
+                        continue
+
+                    entry = self._scan_word_dir(item.name, item.path, dir_mtime, full)
+                    if entry is None:
+                        continue
+                    current[item.name] = entry
+                    stats['updated' if previous else 'added'] += 1
+
+            stats['removed'] = len(set(self.entries) - set(current))
+            previous_mtime = self.dataset_mtime
+            self.entries = current
+            self.dataset_mtime = self._dataset_mtime()
+            self._rebuild_lookup()
+            self._loaded = True
+
+            if stats['added'] or stats['updated'] or stats['removed'] or full or previous_mtime != self.dataset_mtime:
+                self._save_sidecar()
+
+            print(f"Found {len(self.entries)} ISL videos in dataset "
+                  f"({stats['added']} added, {stats['updated']} updated, {stats['removed']} removed)")
+            return stats
+
+    def _ensure_current(self):
+        """Load the sidecar on first use and pick up added or removed word directories"""
+        with self._lock:
+            if not self._loaded:
+                if self._load_sidecar():
+                    self._rebuild_lookup()
+                    self._loaded = True
+                    self._last_check = time.monotonic()
+                    # Words were added or removed since the sidecar was written
+                    if self._dataset_mtime() != self.dataset_mtime:
+                        self.refresh()
+                else:
+                    self.refresh()
+            elif time.monotonic() - self._last_check >= ISL_INDEX_CHECK_SECONDS:
+                self._last_check = time.monotonic()
+                if self._dataset_mtime() != self.dataset_mtime:
+                    self.refresh()
+
+    def videos(self) -> Dict[str, str]:
+        """Return the word to clip path mapping"""
+        self._ensure_current()
+        return self._videos
+
+    def get_entry(self, word: str) -> Optional[Dict]:
+        """Return the full index entry for a word"""
+        self._ensure_current()
+        return self.entries.get(word)
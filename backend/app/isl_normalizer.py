@@ -0,0 +1,106 @@
+import os
+import json
+import hashlib
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from .isl_dataset_index import ISLDatasetIndex, NORMALIZED_SUFFIX
+
+# Canonical encoding every clip is transcoded to, so that concat can always use -c copy
+CANONICAL_PROFILE = {
+    'codec': 'libx264',
+    'profile': 'main',
+    'pix_fmt': 'yuv420p',
+    'width': int(os.getenv("ISL_CLIP_WIDTH", "640")),
+    'height': int(os.getenv("ISL_CLIP_HEIGHT", "480")),
+    'fps': 25,
+    'timescale': 12800,
+    'crf': 23,
+}
+
+PROFILE_ID = hashlib.sha256(json.dumps(CANONICAL_PROFILE, sort_keys=True).encode()).hexdigest()[:12]
+
+def normalized_path_for(video_path: str) -> str:
+    """Return the path of the normalized copy saved next to a clip"""
+    return os.path.splitext(video_path)[0] + NORMALIZED_SUFFIX
+
+def transcode_clip(video_path: str, output_path: str, profile: Dict = CANONICAL_PROFILE) -> bool:
+    """Transcode one clip to the canonical profile, starting on a keyframe"""
+    width, height = profile['width'], profile['height']
+    video_filter = (
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,fps={profile['fps']}"
+    )
+    # Write to a hidden temp file so the dataset scan never picks up a partial clip
+    temp_path = os.path.join(os.path.dirname(output_path), f".{os.path.basename(output_path)}.tmp.mp4")
+    cmd = [
+        'ffmpeg',
+        '-i', video_path,
+        '-an',
+        '-vf', video_filter,
+        '-c:v', profile['codec'],
+        '-profile:v', profile['profile'],
+        '-pix_fmt', profile['pix_fmt'],
+        '-crf', str(profile['crf']),
+        '-g', str(profile['fps']),
+        '-force_key_frames', 'expr:eq(n,0)',
+        '-video_track_timescale', str(profile['timescale']),
+        '-movflags', '+faststart',
+        '-y',
+        temp_path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+    except subprocess.TimeoutExpired:
+        print(f"❌ Timed out normalizing {video_path}")
+        result = None
+
+    if result is None or result.returncode != 0:
+        if result is not None:
+            print(f"❌ Error normalizing {video_path}: {result.stderr}")
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        return False
+
+    os.replace(temp_path, output_path)
+    return True
+
+def normalize_dataset(
+    index: ISLDatasetIndex,
+    force: bool = False,
+    workers: int = 2,
+    progress: Optional[Callable[[int, str], None]] = None
+) -> Dict[str, int]:
+    """Transcode every dataset clip that lacks a normalized copy in the current profile"""
+    index.refresh()
+    pending = [
+        (word, entry) for word, entry in index.entries.items()
+        if force or not index.is_normalized(entry)
+    ]
+    stats = {'normalized': 0, 'failed': 0, 'skipped': len(index.entries) - len(pending)}
+    print(f"🔄 Normalizing {len(pending)} ISL clips to profile {PROFILE_ID}")
+
+    def normalize(item):
+        word, entry = item
+        output_path = normalized_path_for(entry['path'])
+        return word, entry, output_path, transcode_clip(entry['path'], output_path)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for done, (word, entry, output_path, success) in enumerate(executor.map(normalize, pending), start=1):
+                if success:
+                    # Saved once below rather than rewriting the whole index per clip
+                    index.set_normalized(word, output_path, entry['mtime'], save=False)
+                    stats['normalized'] += 1
+                else:
+                    stats['failed'] += 1
+                if progress:
+                    progress(int(done * 100 / len(pending)), f"Normalized {done}/{len(pending)} clips")
+    finally:
+        # Keep the copies finished so far even if the run is interrupted
+        if stats['normalized']:
+            index.save()
+
+    print(f"✅ Normalized {stats['normalized']} clips, {stats['failed']} failed, {stats['skipped']} already up to date")
+    return stats
@@ -0,0 +1,195 @@
+import os
+import json
+import hashlib
+import tempfile
+import time
+import threading
+import subprocess
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Precomposed phrase clip configuration
+ISL_PHRASES_DIR = os.getenv("ISL_PHRASES_DIR", "static/isl_phrases")
+ISL_PHRASE_MIN_COUNT = int(os.getenv("ISL_PHRASE_MIN_COUNT", "10"))  # Occurrences before a phrase is precomposed
+ISL_PHRASE_LIMIT = int(os.getenv("ISL_PHRASE_LIMIT", "200"))
+ISL_PHRASE_MAX_WORDS = int(os.getenv("ISL_PHRASE_MAX_WORDS", "6"))
+# How long replaced phrase clips are kept for renders that already picked them
+ISL_PHRASE_RETIRE_SECONDS = float(os.getenv("ISL_PHRASE_RETIRE_SECONDS", "600"))
+
+def mine_frequent_phrases(
+    word_lists: Iterable[List[str]],
+    min_count: int = ISL_PHRASE_MIN_COUNT,
+    limit: int = ISL_PHRASE_LIMIT,
+    max_words: int = ISL_PHRASE_MAX_WORDS
+) -> List[Tuple[Tuple[str, ...], int]]:
+    """Count word n-grams and return the most frequent ones with their counts"""
+    counts = Counter()
+    for words in word_lists:
+        for length in range(2, max_words + 1):
+            for start in range(len(words) - length + 1):
+                counts[tuple(words[start:start + length])] += 1
+
+    frequent = [(phrase, count) for phrase, count in counts.items() if count >= min_count]
+    # Rank by how many concat inputs the phrase saves across the history
+    frequent.sort(key=lambda item: (item[1] * (len(item[0]) - 1), len(item[0])), reverse=True)
+    return frequent[:limit]
+
+class ISLPhraseLibrary:
+    """Pre-rendered clips for frequent word sequences, matched greedily by length"""
+
+    def __init__(self, directory: str = ISL_PHRASES_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self.phrases: Dict[str, Dict] = {}
+        self.max_words = 0
+        self._index_mtime = None
+        self._lock = threading.Lock()
+
+    def _index_file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.index_path).st_mtime
+        except OSError:
+            return None
+
+    def _read_index(self) -> Dict:
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _ensure_loaded(self):
+        """Load the index, again whenever a rebuild (possibly in a worker process) replaced it"""
+        mtime = self._index_file_mtime()
+        with self._lock:
+            if self._index_mtime is not None and mtime == self._index_mtime:
+                return
+            phrases = self._read_index().get('phrases', {})
+            self._set_phrases({key: entry for key, entry in phrases.items() if os.path.exists(entry['path'])})
+            self._index_mtime = mtime if mtime is not None else 0.0
+
+    def _set_phrases(self, phrases: Dict[str, Dict]):
+        self.phrases = phrases
+        self.max_words = max((len(key.split()) for key in phrases), default=0)
+
+    def _is_current(self, entry: Dict, dataset_index) -> bool:
+        """Check that a phrase clip was built from the dataset's current normalized clips"""
+        if entry.get('profile') != dataset_index.profile_id:
+            return False
+        for word, mtime in entry['sources'].items():
+            source = dataset_index.entries.get(word)
+            if source is None or source.get('mtime') != mtime:
+                return False
+        return True
+
+    def longest_match(self, words: List[str], position: int, dataset_index) -> Tuple[int, Optional[str]]:
+        """Return (word count, clip path) of the longest phrase starting at position"""
+        self._ensure_loaded()
+        for length in range(min(self.max_words, len(words) - position), 1, -1):
+            entry = self.phrases.get(' '.join(words[position:position + length]))
+            if entry and self._is_current(entry, dataset_index):
+                return length, entry['path']
+        return 0, None
+
+    def _clip_path(self, key: str, profile: str, sources: Dict[str, float]) -> str:
+        """Name clips by phrase and source clips, so a re-render never overwrites a clip in use"""
+        digest = hashlib.sha256(json.dumps([key, profile, sources], sort_keys=True).encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest[:16]}.mp4")
+
+    def _write_index(self, data: Dict):
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.index_path)
+
+    def _render(self, clip_paths: List[str], output_path: str) -> bool:
+        """Stream-copy normalized word clips into one phrase clip"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+            file_list_path = f.name
+            for clip_path in clip_paths:
+                f.write(f"file '{os.path.abspath(clip_path)}'\n")
+        temp_path = f"{output_path}.tmp.mp4"
+        try:
+            result = subprocess.run([
+                'ffmpeg', '-f', 'concat', '-safe', '0', '-i', file_list_path,
+                '-c', 'copy', '-movflags', '+faststart', '-y', temp_path
+            ], capture_output=True, text=True, timeout=60)
+        finally:
+            os.unlink(file_list_path)
+        if result.returncode != 0:
+            print(f"❌ Error rendering ISL phrase {output_path}: {result.stderr}")
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            return False
+        os.replace(temp_path, output_path)
+        return True
+
+    def rebuild(self, texts: Iterable[str], generator) -> Dict[str, int]:
+        """Mine frequent phrases from announcement texts and pre-render their clips.
+
+        Requires a fully normalized dataset so phrase clips can be concatenated
+        with single-word clips by stream copy.
+        """
+        self._ensure_loaded()
+        dataset_index = generator.dataset_index
+        dataset_index.refresh()
+        if not dataset_index.fully_normalized:
+            raise RuntimeError("ISL dataset must be normalized before building phrase clips")
+
+        available_videos = generator.available_videos
+        frequent = mine_frequent_phrases(generator._extract_words_improved(text) for text in texts)
+        os.makedirs(self.directory, exist_ok=True)
+
+        phrases = {}
+        stats = {'mined': len(frequent), 'rendered': 0, 'reused': 0, 'skipped': 0}
+        for phrase, count in frequent:
+            dataset_words = [generator._resolve_word(word, available_videos) for word in phrase]
+            if None in dataset_words:
+                # Words without a clip are dropped at render time, so the phrase wouldn't match
+                stats['skipped'] += 1
+                continue
+
+            key = ' '.join(phrase)
+            sources = {word: dataset_index.entries[word]['mtime'] for word in dataset_words}
+            entry = {
+                'path': self._clip_path(key, dataset_index.profile_id, sources),
+                'profile': dataset_index.profile_id,
+                'sources': sources,
+                'count': count
+            }
+            previous = self.phrases.get(key)
+            if previous and os.path.exists(previous['path']) and self._is_current(previous, dataset_index):
+                entry['path'] = previous['path']
+                stats['reused'] += 1
+            elif self._render([available_videos[word] for word in dataset_words], entry['path']):
+                stats['rendered'] += 1
+            else:
+                stats['skipped'] += 1
+                continue
+            phrases[key] = entry
+
+        # Clips of replaced or no longer frequent phrases are retired rather than deleted,
+        # since renders in progress (in this or another process) may still use them
+        now = time.time()
+        kept_paths = {entry['path'] for entry in phrases.values()}
+        retired = {path: retired_at for path, retired_at in self._read_index().get('retired', {}).items()
+                   if path not in kept_paths}
+        for entry in self.phrases.values():
+            if entry['path'] not in kept_paths:
+                retired.setdefault(entry['path'], now)
+        expired = [path for path, retired_at in retired.items() if now - retired_at >= ISL_PHRASE_RETIRE_SECONDS]
+        for path in expired:
+            del retired[path]
+
+        # Swap the index atomically before removing anything it no longer references
+        self._write_index({'phrases': phrases, 'retired': retired})
+        with self._lock:
+            self._set_phrases(phrases)
+            self._index_mtime = self._index_file_mtime()
+        for path in expired:
+            if os.path.exists(path):
+                os.unlink(path)
+
+        print(f"✅ ISL phrase library: {len(phrases)} phrases "
+              f"({stats['rendered']} rendered, {stats['reused']} reused, {stats['skipped']} skipped)")
+        return stats
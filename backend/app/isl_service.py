@@ -0,0 +1,114 @@
+import os
+import uuid
+from typing import Callable, Dict, Optional
+
+from .audio_generator import audio_generator
+from .isl_video_generator import isl_generator
+
+ISL_VIDEOS_DIR = "/var/www/html/isl_videos"
+FALLBACK_ISL_VIDEOS_DIR = "isl_videos"
+
+# Languages spoken over the ISL video, in mixing order
+ISL_AUDIO_LANGUAGES = {
+    'english': 'en',
+    'hindi': 'hi',
+    'marathi': 'mr',
+    'gujarati': 'gu'
+}
+
+def get_isl_videos_dir() -> str:
+    """Return the directory for generated ISL videos, creating it if needed"""
+    isl_videos_dir = ISL_VIDEOS_DIR
+    try:
+        os.makedirs(isl_videos_dir, exist_ok=True)
+        # Set permissions for web server access
+        os.chmod(isl_videos_dir, 0o755)
+        # Try to set ownership to current user if possible
+        try:
+            import pwd
+            current_uid = os.getuid()
+            os.chown(isl_videos_dir, current_uid, -1)
+        except (ImportError, OSError):
+            pass  # Skip ownership change if not possible
+    except PermissionError:
+        # Fallback to backend directory if permission denied
+        isl_videos_dir = FALLBACK_ISL_VIDEOS_DIR
+        os.makedirs(isl_videos_dir, exist_ok=True)
+    return isl_videos_dir
+
+def find_isl_video(filename: str) -> Optional[str]:
+    """Return the path of a generated ISL video, or None if it no longer exists"""
+    for directory in (ISL_VIDEOS_DIR, FALLBACK_ISL_VIDEOS_DIR):
+        video_path = os.path.join(directory, filename)
+        if os.path.exists(video_path):
+            return video_path
+    return None
+
+def render_isl_announcement(
+    english_text: str,
+    include_audio: bool = True,
+    progress: Optional[Callable[[int, str], None]] = None
+) -> Dict:
+    """Generate audio tracks and the ISL video for an announcement.
+
+    Blocking; run it on a worker pool or from the job worker. ``progress`` is
+    called with a percentage and a short status message after each stage.
+    """
+    def report(percent: int, message: str):
+        if progress:
+            progress(percent, message)
+
+    isl_videos_dir = get_isl_videos_dir()
+
+    # Generate unique filename
+    filename = f"isl_announcement_{uuid.uuid4().hex[:8]}.mp4"
+    output_path = os.path.join(isl_videos_dir, filename)
+
+    # Generate audio files for all languages if requested
+    audio_files = {}
+    try:
+        if include_audio:
+            try:
+                for index, (lang_name, lang_code) in enumerate(ISL_AUDIO_LANGUAGES.items()):
+                    report(10 + index * 15, f"Generating {lang_name} audio")
+                    # Generate audio using the audio generator
+                    audio_content = audio_generator.generate_audio(english_text, lang_code)
+
+                    # Save audio to temporary file
+                    temp_audio_path = f"/tmp/isl_audio_{lang_name}_{uuid.uuid4().hex[:8]}.mp3"
+                    with open(temp_audio_path, 'wb') as f:
+                        f.write(audio_content)
+
+                    audio_files[lang_name] = temp_audio_path
+                    print(f"Generated audio for {lang_name}: {temp_audio_path}")
+
+            except Exception as e:
+                print(f"Error generating audio files: {e}")
+                # Continue without audio if there's an error
+
+        # Generate ISL video with audio
+        report(70, "Rendering ISL video")
+        result_path = isl_generator.generate_isl_video(english_text, output_path, audio_files)
+
+        if not result_path:
+            raise RuntimeError("Failed to generate ISL video")
+    finally:
+        # Clean up temporary audio files
+        for audio_path in audio_files.values():
+            try:
+                if os.path.exists(audio_path):
+                    os.unlink(audio_path)
+                    print(f"Cleaned up temporary audio file: {audio_path}")
+            except Exception as e:
+                print(f"Error cleaning up audio file {audio_path}: {e}")
+
+    # Get file size
+    file_size = os.path.getsize(result_path) if os.path.exists(result_path) else 0
+    report(100, "ISL video generated")
+
+    return {
+        "filename": filename,
+        "file_path": result_path,
+        "file_size": file_size,
+        "video_url": f"/isl-videos/{filename}"
+    }
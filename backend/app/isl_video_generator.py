@@ -1,18 +1,39 @@
 import os
 import re
+import shutil
+import hashlib
 import subprocess
 from typing import List, Dict
 import tempfile
+import time
 import uuid
 
+from .isl_dataset_index import ISLDatasetIndex
+from .isl_normalizer import PROFILE_ID
+from .isl_phrases import ISLPhraseLibrary
+from .disk_cache import DiskLRUCache, make_cache_key
+
+# Rendered ISL video cache configuration
+ISL_VIDEO_CACHE_DIR = os.getenv("ISL_VIDEO_CACHE_DIR", "static/isl_video_cache")
+ISL_VIDEO_CACHE_MAX_BYTES = int(os.getenv("ISL_VIDEO_CACHE_MAX_MB", "2048")) * 1024 * 1024
+
 class ISLVideoGenerator:
     def __init__(self, dataset_path: str = "static/isl_dataset"):
         self.dataset_path = dataset_path
-        self.available_videos = self._scan_dataset()
-        self._check_ffmpeg()
+        # Loaded lazily from the persisted index on first lookup
+        self.dataset_index = ISLDatasetIndex(dataset_path, profile_id=PROFILE_ID)
+        self._ffmpeg_checked = False
+        self.video_cache = DiskLRUCache(ISL_VIDEO_CACHE_DIR, ISL_VIDEO_CACHE_MAX_BYTES, suffix=".mp4")
+        self.phrase_library = ISLPhraseLibrary()
+    
+    @property
+    def available_videos(self) -> Dict[str, str]:
+        """Word to clip path mapping of the ISL dataset"""
+        return self.dataset_index.videos()
     
     def _check_ffmpeg(self):
         """Check if FFmpeg is available on the system"""
+        self._ffmpeg_checked = True
         try:
             result = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True)
             if result.returncode == 0:
@@ -22,26 +43,9 @@ class ISLVideoGenerator:
         except FileNotFoundError:
             print("❌ FFmpeg is not installed. Please install FFmpeg to use ISL video generation.")
         
-    def _scan_dataset(self) -> Dict[str, str]:
-        """Scan the ISL dataset and return available videos"""
-        available_videos = {}
-        
-        if not os.path.exists(self.dataset_path):
-            print(f"Warning: ISL dataset path {self.dataset_path} does not exist")
-            return available_videos
-            
-        for item in os.listdir(self.dataset_path):
-            item_path = os.path.join(self.dataset_path, item)
-            if os.path.isdir(item_path):
-                # Check for video file in the directory
-                for file in os.listdir(item_path):
-                    if file.endswith('.mp4'):
-                        video_path = os.path.join(item_path, file)
-                        available_videos[item] = video_path
-                        break
-        
-        print(f"Found {len(available_videos)} ISL videos in dataset")
-        return available_videos
+    def rescan_dataset(self, full: bool = False) -> Dict[str, int]:
+        """Refresh the dataset index; with ``full`` every clip is re-probed"""
+        return self.dataset_index.refresh(full=full)
     
     def _extract_words(self, text: str) -> List[str]:
         """Extract individual words from text, handling special cases"""
@@ -168,160 +172,161 @@ class ISLVideoGenerator:
         
         return word in train_station_words
     
-    def _build_ffmpeg_command_with_audio(self, file_list_path: str, audio_files: dict, output_path: str) -> bool:
-        """Build and execute FFmpeg command to concatenate videos and embed merged audio"""
-        # First, create a temporary video without audio
-        temp_video = f"/tmp/temp_video_{uuid.uuid4().hex[:8]}.mp4"
-        
-        # Build the command to concatenate videos first
-        concat_cmd = [
-            'ffmpeg',
-            '-f', 'concat',
-            '-safe', '0',
-            '-i', file_list_path,
-            '-c', 'copy',
-            '-y',
-            temp_video
-        ]
-        
-        # Execute the concat command
-        result = subprocess.run(concat_cmd, capture_output=True, text=True, timeout=60)
-        if result.returncode != 0:
-            print(f"Error creating temp video: {result.stderr}")
-            return False
-        
-        # Check if temp video was created
-        if not os.path.exists(temp_video):
-            print(f"Temp video was not created: {temp_video}")
-            return False
-        
-        # First, merge all audio files into a single audio file
-        merged_audio = f"/tmp/merged_audio_{uuid.uuid4().hex[:8]}.aac"
-        
+    def _build_ffmpeg_command_with_audio(self, file_list_path: str, audio_files: dict, output_path: str, timings: dict = None) -> bool:
+        """Concatenate videos, mix the audio tracks and mux them in a single FFmpeg pass"""
         # Collect valid audio files
         valid_audio_files = []
-        for language, audio_path in audio_files.items():
+        for language, audio_path in (audio_files or {}).items():
             if os.path.exists(audio_path):
                 valid_audio_files.append(audio_path)
         
-        if not valid_audio_files:
-            # No valid audio files, just copy the temp video
-            try:
-                os.rename(temp_video, output_path)
-                return True
-            except Exception as e:
-                print(f"Error copying temp video: {e}")
-                return False
-        
-        # Build audio merge command
-        audio_inputs = []
-        audio_filters = []
-        
-        for i, audio_path in enumerate(valid_audio_files):
-            audio_inputs.extend(['-i', audio_path])
-            audio_filters.append(f'[{i}:a]')
-        
-        # Merge audio files
-        audio_merge_cmd = [
-            'ffmpeg'
-        ] + audio_inputs + [
-            '-filter_complex', f'{"".join(audio_filters)}amix=inputs={len(audio_filters)}:duration=longest[aout]',
-            '-map', '[aout]',
-            '-c:a', 'aac',
-            '-b:a', '192k',
-            '-y',
-            merged_audio
-        ]
-        
-        print(f"Merging audio files: {valid_audio_files}")
-        result = subprocess.run(audio_merge_cmd, capture_output=True, text=True, timeout=60)
-        if result.returncode != 0:
-            print(f"Error merging audio files: {result.stderr}")
-            # Clean up temp video
-            try:
-                os.unlink(temp_video)
-            except:
-                pass
-            return False
-        
-        # Now embed the merged audio into the video
-        final_cmd = [
+        # Input 0 is the concatenated video, inputs 1..N are the audio tracks
+        cmd = [
             'ffmpeg',
-            '-i', temp_video,
-            '-i', merged_audio,
-            '-c:v', 'copy',
-            '-c:a', 'aac',
-            '-b:a', '192k',
-            '-shortest',  # End when shortest stream ends
-            '-y',
-            output_path
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', file_list_path
         ]
+        for audio_path in valid_audio_files:
+            cmd.extend(['-i', audio_path])
         
-        print(f"Embedding merged audio into video...")
-        result = subprocess.run(final_cmd, capture_output=True, text=True, timeout=60)
-        
-        # Clean up temporary files
-        try:
-            os.unlink(temp_video)
-            os.unlink(merged_audio)
-        except:
-            pass
+        if not valid_audio_files:
+            # Nothing to mix, stream-copy the concatenated clips as they are
+            cmd.extend(['-c', 'copy'])
+        else:
+            cmd.extend(['-map', '0:v', '-c:v', 'copy'])
+        
+        if len(valid_audio_files) > 1:
+            audio_filters = ''.join(f'[{i}:a]' for i in range(1, len(valid_audio_files) + 1))
+            cmd.extend([
+                '-filter_complex', f'{audio_filters}amix=inputs={len(valid_audio_files)}:duration=longest[aout]',
+                '-map', '[aout]'
+            ])
+        elif valid_audio_files:
+            cmd.extend(['-map', '1:a'])
+        
+        if valid_audio_files:
+            cmd.extend([
+                '-c:a', 'aac',
+                '-b:a', '192k',
+                '-shortest'  # End when shortest stream ends
+            ])
+        
+        cmd.extend(['-y', output_path])
+        
+        print(f"Running FFmpeg command: {' '.join(cmd)}")
+        start_time = time.perf_counter()
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        if timings is not None:
+            timings['ffmpeg'] = time.perf_counter() - start_time
         
         if result.returncode != 0:
-            print(f"Error embedding audio into video: {result.stderr}")
+            print(f"FFmpeg error: {result.stderr}")
             return False
         
         return True
     
+    def _sequence_cache_key(self, video_paths: List[str], audio_files: dict) -> str:
+        """Key a rendered video by its clip sequence and the content of its audio tracks"""
+        key_parts = []
+        for video_path in video_paths:
+            # Include the mtime so a replaced clip invalidates old renders
+            key_parts.append(f"{os.path.abspath(video_path)}:{os.path.getmtime(video_path)}")
+        for language, audio_path in (audio_files or {}).items():
+            if os.path.exists(audio_path):
+                with open(audio_path, 'rb') as f:
+                    key_parts.append(f"{language}:{hashlib.sha256(f.read()).hexdigest()}")
+        return make_cache_key(*key_parts)
+    
+    def _copy_from_cache(self, cached_path: str, output_path: str):
+        """Hard-link a cached render to the output path, copying across filesystems"""
+        if os.path.exists(output_path):
+            os.unlink(output_path)
+        try:
+            os.link(cached_path, output_path)
+        except OSError:
+            shutil.copyfile(cached_path, output_path)
+    
+    def _resolve_word(self, word: str, available_videos: Dict[str, str]) -> str:
+        """Return the dataset word whose clip signs the given word, or None"""
+        # Direct match
+        if word in available_videos:
+            return word
+        
+        # Try to find partial matches for common words
+        if word in ['arriving', 'arrive', 'arrived']:
+            if 'arriving' in available_videos:
+                return 'arriving'
+        
+        if word in ['platform', 'platforms']:
+            if 'platform' in available_videos:
+                return 'platform'
+        
+        if word in ['number', 'numbers']:
+            if 'number' in available_videos:
+                return 'number'
+        
+        if word in ['train', 'trains']:
+            if 'train' in available_videos:
+                return 'train'
+        
+        return None
+    
     def _find_matching_videos(self, words: List[str]) -> List[str]:
-        """Find matching ISL videos for the given words"""
+        """Find matching ISL videos for the given words, preferring precomposed phrases"""
         matching_videos = []
-        
-        for word in words:
-            # Direct match
-            if word in self.available_videos:
-                matching_videos.append(self.available_videos[word])
-                continue
-            
-            # Try to find partial matches for common words
-            if word in ['arriving', 'arrive', 'arrived']:
-                if 'arriving' in self.available_videos:
-                    matching_videos.append(self.available_videos['arriving'])
-                    continue
-            
-            if word in ['platform', 'platforms']:
-                if 'platform' in self.available_videos:
-                    matching_videos.append(self.available_videos['platform'])
+        available_videos = self.available_videos
+        
+        # Phrase clips share the normalized profile, so they can only be mixed with normalized word clips
+        use_phrases = self.dataset_index.fully_normalized
+        
+        position = 0
+        while position < len(words):
+            # Greedy longest match against the precomposed phrase clips
+            if use_phrases:
+                phrase_length, phrase_path = self.phrase_library.longest_match(words, position, self.dataset_index)
+                if phrase_path:
+                    matching_videos.append(phrase_path)
+                    position += phrase_length
                     continue
             
-            if word in ['number', 'numbers']:
-                if 'number' in self.available_videos:
-                    matching_videos.append(self.available_videos['number'])
-                    continue
-            
-            if word in ['train', 'trains']:
-                if 'train' in self.available_videos:
-                    matching_videos.append(self.available_videos['train'])
-                    continue
+            word = words[position]
+            position += 1
+            dataset_word = self._resolve_word(word, available_videos)
+            if dataset_word:
+                matching_videos.append(available_videos[dataset_word])
+                continue
             
             # If no match found, we'll skip this word
             print(f"No ISL video found for word: {word}")
         
         return matching_videos
     
-    def generate_isl_video(self, english_text: str, output_path: str = None, audio_files: dict = None) -> str:
-        """Generate ISL video from English text using FFmpeg with embedded audio"""
+    def generate_isl_video(self, english_text: str, output_path: str = None, audio_files: dict = None, timings: dict = None) -> str:
+        """Generate ISL video from English text using FFmpeg with embedded audio.
+        
+        If ``timings`` is given it is filled with the duration of each stage in seconds.
+        """
         if not output_path:
             output_path = f"isl_announcement_{uuid.uuid4().hex[:8]}.mp4"
+        if timings is None:
+            timings = {}
+        
+        if not self._ffmpeg_checked:
+            self._check_ffmpeg()
         
         print(f"Generating ISL video for text: {english_text}")
         
         # Extract words from text with proper train name handling
+        stage_start = time.perf_counter()
         words = self._extract_words_improved(english_text)
+        timings['extract_words'] = time.perf_counter() - stage_start
         print(f"Extracted words: {words}")
         
         # Find matching videos
+        stage_start = time.perf_counter()
         video_paths = self._find_matching_videos(words)
+        timings['match_videos'] = time.perf_counter() - stage_start
         print(f"Found {len(video_paths)} matching videos")
         
         if not video_paths:
@@ -329,56 +334,48 @@ class ISLVideoGenerator:
             return None
         
         try:
+            # Identical announcements resolve to identical clips and audio; reuse the earlier render
+            stage_start = time.perf_counter()
+            cache_key = self._sequence_cache_key(video_paths, audio_files)
+            cached_path = self.video_cache.get_path(cache_key)
+            if cached_path:
+                self._copy_from_cache(cached_path, output_path)
+                timings['cache_hit'] = time.perf_counter() - stage_start
+                print(f"✅ ISL video served from cache: {output_path}")
+                return output_path
+            timings['cache_lookup'] = time.perf_counter() - stage_start
+            
             # Create a temporary file list for FFmpeg
+            stage_start = time.perf_counter()
             with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
                 file_list_path = f.name
                 for video_path in video_paths:
                     # Use absolute path to avoid path issues
                     abs_video_path = os.path.abspath(video_path)
                     f.write(f"file '{abs_video_path}'\n")
+            timings['file_list'] = time.perf_counter() - stage_start
             
             print(f"Created file list: {file_list_path}")
             print(f"Videos to merge: {video_paths}")
             
-            # Prepare FFmpeg command
-            if audio_files and len(audio_files) > 0:
-                # Generate video with embedded audio
-                print("Generating ISL video with embedded audio...")
-                success = self._build_ffmpeg_command_with_audio(file_list_path, audio_files, output_path)
-                if not success:
-                    print("Failed to generate ISL video with audio")
-                    return None
-            else:
-                # Generate video without audio
-                print("Generating ISL video without audio...")
-                ffmpeg_cmd = [
-                    'ffmpeg',
-                    '-f', 'concat',
-                    '-safe', '0',
-                    '-i', file_list_path,
-                    '-c', 'copy',
-                    '-y',  # Overwrite output file if it exists
-                    output_path
-                ]
-                
-                print(f"Running FFmpeg command: {' '.join(ffmpeg_cmd)}")
-                
-                # Execute FFmpeg command
-                result = subprocess.run(
-                    ffmpeg_cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=60  # 60 second timeout
-                )
-                
-                if result.returncode != 0:
-                    print(f"FFmpeg error: {result.stderr}")
-                    return None
+            try:
+                if audio_files:
+                    print("Generating ISL video with embedded audio...")
+                else:
+                    print("Generating ISL video without audio...")
+                success = self._build_ffmpeg_command_with_audio(file_list_path, audio_files, output_path, timings)
+            finally:
+                # Clean up temporary file list
+                os.unlink(file_list_path)
+            
+            if not success:
+                print("Failed to generate ISL video")
+                return None
             
-            # Clean up temporary file list
-            os.unlink(file_list_path)
+            self.video_cache.put_file(cache_key, output_path)
             
-            print(f"✅ ISL video generated successfully: {output_path}")
+            stage_summary = ', '.join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in timings.items())
+            print(f"✅ ISL video generated successfully: {output_path} ({stage_summary})")
             return output_path
             
         except subprocess.TimeoutExpired:
@@ -0,0 +1,241 @@
+import os
+import json
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import SessionLocal
+from .disk_cache import make_cache_key
+from .isl_service import render_isl_announcement, find_isl_video
+from .isl_video_generator import isl_generator
+from .audio_generator import audio_generator
+from .announcement_audio import value_clip_library, number_vocabulary
+
+# Worker configuration
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1.0"))
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "600"))  # Requeue running jobs without progress updates
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+ISL_PHRASE_HISTORY_LIMIT = int(os.getenv("ISL_PHRASE_HISTORY_LIMIT", "5000"))  # Recent announcements mined for phrases
+
+ACTIVE_STATUSES = ("queued", "running")
+
+def _utcnow() -> datetime:
+    return datetime.utcnow()
+
+def run_isl_video_job(payload: Dict, progress: Callable[[int, str], None]) -> Dict:
+    """Render an ISL video for a queued job"""
+    return render_isl_announcement(
+        payload["english_text"],
+        payload.get("include_audio", True),
+        progress=progress
+    )
+
+def isl_video_result_available(result: Dict) -> bool:
+    """Check that a stored ISL video result still exists on disk"""
+    return find_isl_video(result.get("filename", "")) is not None
+
+def run_isl_phrases_job(payload: Dict, progress: Callable[[int, str], None]) -> Dict:
+    """Rebuild the precomposed ISL phrase clips from recent announcement history"""
+    db = SessionLocal()
+    try:
+        rows = db.query(models.GeneratedAnnouncement.final_text).order_by(
+            models.GeneratedAnnouncement.id.desc()
+        ).limit(ISL_PHRASE_HISTORY_LIMIT).all()
+    finally:
+        db.close()
+
+    progress(10, f"Mining phrases from {len(rows)} announcements")
+    return isl_generator.phrase_library.rebuild([row.final_text for row in rows], isl_generator)
+
+def run_audio_library_job(payload: Dict, progress: Callable[[int, str], None]) -> Dict:
+    """Pre-render value clips for every language.
+
+    Without explicit ``values`` the whole vocabulary is rendered: the numbers
+    and the names of all active stations. Clips already on disk are skipped.
+    """
+    values = payload.get("values")
+    if values is None:
+        db = SessionLocal()
+        try:
+            station_names = [row.station_name for row in db.query(models.StationMaster.station_name).filter(
+                models.StationMaster.is_active == True
+            ).all()]
+        finally:
+            db.close()
+        values = number_vocabulary() + station_names
+
+    languages = payload.get("languages") or audio_generator.get_supported_languages()
+    return value_clip_library.prerender(values, languages, progress)
+
+# Job type -> (handler, check that a stored result is still usable)
+JOB_HANDLERS: Dict[str, Tuple[Callable, Callable[[Dict], bool]]] = {
+    "isl_video": (run_isl_video_job, isl_video_result_available),
+    # History changes between runs, so a finished rebuild is never reused
+    "isl_phrases": (run_isl_phrases_job, lambda result: False),
+    # Re-running is cheap since existing clips are skipped, and picks up new stations
+    "audio_library": (run_audio_library_job, lambda result: False),
+}
+
+def enqueue_job(db: Session, job_type: str, payload: Dict, created_by: Optional[int] = None) -> Tuple[models.Job, bool]:
+    """Queue a job, reusing an identical queued, running or completed job of the same creator.
+
+    Returns the job and whether it was deduplicated against an existing one.
+    Jobs aren't shared between users, since only their creator may read them;
+    identical work is still reused through the render caches.
+    """
+    if job_type not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job type: {job_type}")
+
+    dedup_key = make_cache_key(job_type, json.dumps(payload, sort_keys=True))
+    existing_jobs = db.query(models.Job).filter(
+        models.Job.dedup_key == dedup_key,
+        models.Job.created_by == created_by,
+        models.Job.status.in_(ACTIVE_STATUSES + ("completed",))
+    ).order_by(models.Job.id.desc()).all()
+
+    _, result_available = JOB_HANDLERS[job_type]
+    for job in existing_jobs:
+        if job.status in ACTIVE_STATUSES:
+            return job, True
+        if job.result and result_available(json.loads(job.result)):
+            return job, True
+
+    job = models.Job(
+        job_type=job_type,
+        dedup_key=dedup_key,
+        payload=json.dumps(payload),
+        status="queued",
+        progress=0,
+        created_by=created_by
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job, False
+
+def requeue_stale_jobs(db: Session) -> int:
+    """Return running jobs whose worker stopped reporting progress to the queue"""
+    cutoff = _utcnow() - timedelta(seconds=JOB_STALE_SECONDS)
+    requeued = db.query(models.Job).filter(
+        models.Job.status == "running",
+        models.Job.updated_at < cutoff
+    ).update({"status": "queued", "worker_id": None}, synchronize_session=False)
+    db.commit()
+    return requeued
+
+def claim_next_job(db: Session, worker_id: str) -> Optional[models.Job]:
+    """Atomically move the oldest queued job to running for this worker"""
+    while True:
+        candidate = db.query(models.Job.id).filter(
+            models.Job.status == "queued"
+        ).order_by(models.Job.id).first()
+        if candidate is None:
+            return None
+
+        # Only one worker wins the conditional update
+        claimed = db.query(models.Job).filter(
+            models.Job.id == candidate.id,
+            models.Job.status == "queued"
+        ).update({
+            "status": "running",
+            "worker_id": worker_id,
+            "attempts": models.Job.attempts + 1,
+            "started_at": _utcnow(),
+            "updated_at": _utcnow()
+        }, synchronize_session=False)
+        db.commit()
+        if claimed:
+            return db.query(models.Job).filter(models.Job.id == candidate.id).first()
+
+def _update_job(job_id: int, **values):
+    db = SessionLocal()
+    try:
+        values["updated_at"] = _utcnow()
+        db.query(models.Job).filter(models.Job.id == job_id).update(values, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+def process_job(job: models.Job):
+    """Run a claimed job and record its outcome"""
+    handler, _ = JOB_HANDLERS[job.job_type]
+
+    def progress(percent: int, message: str):
+        _update_job(job.id, progress=percent, message=message)
+
+    try:
+        result = handler(json.loads(job.payload), progress)
+        _update_job(
+            job.id,
+            status="completed",
+            progress=100,
+            result=json.dumps(result),
+            error=None,
+            finished_at=_utcnow()
+        )
+        print(f"✅ Job {job.id} ({job.job_type}) completed")
+    except Exception as e:
+        # Retry until the attempt budget is spent
+        retry = job.attempts < JOB_MAX_ATTEMPTS
+        _update_job(
+            job.id,
+            status="queued" if retry else "failed",
+            worker_id=None,
+            error=str(e),
+            finished_at=None if retry else _utcnow()
+        )
+        print(f"❌ Job {job.id} ({job.job_type}) failed: {e}")
+
+class JobWorker:
+    """Polls the jobs table and processes queued jobs one at a time"""
+
+    def __init__(self, worker_id: Optional[str] = None, poll_interval: float = JOB_POLL_INTERVAL_SECONDS):
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.poll_interval = poll_interval
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def run_once(self) -> bool:
+        """Process at most one job; returns whether a job was found"""
+        db = SessionLocal()
+        try:
+            requeue_stale_jobs(db)
+            job = claim_next_job(db, self.worker_id)
+            if job is None:
+                return False
+            db.expunge(job)
+        finally:
+            db.close()
+
+        print(f"🔧 Worker {self.worker_id} processing job {job.id} ({job.job_type})")
+        process_job(job)
+        return True
+
+    def run_forever(self):
+        """Process jobs until stop() is called"""
+        print(f"🚀 Job worker {self.worker_id} started")
+        while not self._stop_event.is_set():
+            try:
+                if self.run_once():
+                    continue
+            except Exception as e:
+                print(f"❌ Job worker error: {e}")
+            self._stop_event.wait(self.poll_interval)
+        print(f"🛑 Job worker {self.worker_id} stopped")
+
+    def start(self):
+        """Run the worker loop on a background thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self.run_forever, name="job-worker", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -1,23 +1,39 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Request, File, UploadFile
+from fastapi import FastAPI, Depends, HTTPException, status, Request, File, UploadFile, Query, Response, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
-from datetime import timedelta
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from datetime import datetime, timedelta
 import os
 import json
 import time
-from typing import List
+from typing import List, Optional
 
-from . import models, schemas, auth
-from .database import engine, get_db
+from . import models, schemas, auth, executors, jobs, migrations
+from .database import engine, get_db, get_async_db
 from .translation import translation_service
 from .audio_generator import audio_generator
+from .mp3_utils import concat_mp3
 from .isl_video_generator import isl_generator
+from .isl_service import render_isl_announcement
+from .template_translation import (
+    TEMPLATE_LANGUAGES, fill_placeholders, get_template_skeletons, translate_announcement_values
+)
+from .announcement_audio import segmented_audio, value_clip_library
+from .pagination import PAGE_SIZE_MAX, PAGE_SIZE_DEFAULT, NEXT_CURSOR_HEADER, paginate, page_response
+from .announcement_stream import ALL_STATIONS, SSE_REPLAY_LIMIT, announcement_bus, channel_for, stream_events
 
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
+# Bring existing databases up to date (e.g. indexes added after their tables were created)
+migrations.run_pending_migrations(engine)
+
+# Run a job worker inside the API process unless workers are deployed separately (run_worker.py)
+JOB_WORKER_IN_PROCESS = os.getenv("JOB_WORKER_IN_PROCESS", "true").lower() == "true"
+job_worker = jobs.JobWorker()
 
 app = FastAPI(
     title="IRAS-DDH API",
@@ -35,11 +51,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],  # Let the frontend read the next page cursor
 )
 # NOTE: For production, set allow_origins to your frontend domain(s) only for security.
 
 # Create default users on startup
-def create_default_users():
+async def create_default_users():
     db = Session(engine)
     try:
         # Check if default users already exist
@@ -51,7 +68,7 @@ def create_default_users():
             admin_user = models.User(
                 email="admin@indianrail.gov.in",
                 username="admin",
-                hashed_password=auth.get_password_hash("admin123"),
+                hashed_password=await auth.get_password_hash_async("admin123"),
                 role="admin",
                 station_code=None
             )
@@ -63,7 +80,7 @@ def create_default_users():
             operator_user = models.User(
                 email="operator@indianrail.gov.in",
                 username="operator",
-                hashed_password=auth.get_password_hash("operator123"),
+                hashed_password=await auth.get_password_hash_async("operator123"),
                 role="operator",
                 station_code="NDLS"  # Default to New Delhi station
             )
@@ -75,6 +92,7 @@ def create_default_users():
             print("✅ Updated existing operator with NDLS station code")
         
         db.commit()
+        auth.invalidate_cached_user()
         print("🎉 Default users setup completed!")
         
     except Exception as e:
@@ -125,10 +143,22 @@ def create_default_stations():
     finally:
         db.close()
 
+def write_bytes(path: str, content: bytes):
+    """Write binary content to a file (run on the media pool)"""
+    with open(path, 'wb') as f:
+        f.write(content)
+
 # Create default users on startup
 @app.on_event("startup")
 async def startup_event():
-    create_default_users()
+    await create_default_users()
+    if JOB_WORKER_IN_PROCESS:
+        job_worker.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    job_worker.stop(timeout=5)
+    executors.shutdown()
 
 @app.get("/")
 async def root():
@@ -140,7 +170,14 @@ async def root():
 
 @app.post("/auth/login", response_model=schemas.Token)
 async def login(user_credentials: schemas.UserLogin, db: Session = Depends(get_db)):
-    user = auth.authenticate_user(db, user_credentials.email, user_credentials.password)
+    try:
+        user = await auth.authenticate_user_async(db, user_credentials.email, user_credentials.password)
+    except executors.ExecutorSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many logins in progress, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -170,7 +207,27 @@ async def login(user_credentials: schemas.UserLogin, db: Session = Depends(get_d
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "user": user
+        "user": user,
+        "refresh_token": auth.create_refresh_token(db, user)
+    }
+
+@app.post("/auth/refresh", response_model=schemas.RefreshResponse)
+async def refresh_access_token(request: schemas.RefreshRequest, db: Session = Depends(get_db)):
+    """Exchange a refresh token for a new access token without checking the password again.
+
+    The refresh token is rotated: the one sent is revoked and a new one returned.
+    """
+    user = auth.consume_refresh_token(db, request.refresh_token)
+    if user is None:
+        raise auth.credentials_exception()
+    
+    access_token = auth.create_access_token(
+        data={"sub": user.email}, expires_delta=timedelta(minutes=auth.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return {
+        "access_token": access_token,
+        "refresh_token": auth.create_refresh_token(db, user),
+        "token_type": "bearer"
     }
 
 @app.get("/auth/me", response_model=schemas.User)
@@ -179,6 +236,10 @@ async def get_current_user_info(current_user: models.User = Depends(auth.get_cur
 
 @app.get("/auth/users", response_model=list[schemas.User])
 async def get_users(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     current_user: models.User = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -189,8 +250,8 @@ async def get_users(
             detail="Not enough permissions"
         )
     
-    users = db.query(models.User).all()
-    return users
+    users = paginate(db.query(models.User), models.User, limit, cursor).all()
+    return page_response(users, limit, response, schemas.User, fields)
 
 @app.post("/auth/register", response_model=schemas.User)
 async def register_user(
@@ -224,7 +285,14 @@ async def register_user(
         )
     
     # Create new user
-    hashed_password = auth.get_password_hash(user.password)
+    try:
+        hashed_password = await auth.get_password_hash_async(user.password)
+    except executors.ExecutorSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many password operations in progress, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
     db_user = models.User(
         email=user.email,
         username=user.username,
@@ -236,6 +304,7 @@ async def register_user(
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    auth.invalidate_cached_user(db_user.email)
     
     return db_user
 
@@ -277,7 +346,9 @@ async def delete_user(
     try:
         # Soft delete by setting is_active to False
         db_user.is_active = False
+        auth.revoke_refresh_tokens(db, db_user.id)
         db.commit()
+        auth.invalidate_cached_user(db_user.email)
         
         return {
             "message": f"User {db_user.username} has been successfully deleted",
@@ -296,6 +367,88 @@ async def delete_user(
             detail=f"Failed to delete user: {str(e)}"
         )
 
+# Device Token Endpoints (Admin Only)
+@app.post("/devices", response_model=schemas.DeviceTokenCreated)
+async def create_device_token(
+    device: schemas.DeviceTokenCreate,
+    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Issue a token for a station display screen; the token is only shown in this response"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    station_code = device.station_code.strip().upper()
+    if station_code != "ALL" and not db.query(models.StationMaster).filter(
+        models.StationMaster.station_code == station_code
+    ).first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Station code '{station_code}' does not exist"
+        )
+    
+    token, prefix, token_hash = auth.generate_device_token()
+    db_device = models.DeviceToken(
+        name=device.name,
+        station_code=station_code,
+        token_prefix=prefix,
+        token_hash=token_hash,
+        created_by=current_user.id
+    )
+    db.add(db_device)
+    db.commit()
+    db.refresh(db_device)
+    
+    print(f"✅ Device token {prefix} issued for {station_code}")
+    return schemas.DeviceTokenCreated(
+        **schemas.DeviceToken.model_validate(db_device).model_dump(),
+        token=token
+    )
+
+@app.get("/devices", response_model=List[schemas.DeviceToken])
+async def get_device_tokens(
+    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """List device tokens, including revoked ones (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return db.query(models.DeviceToken).order_by(models.DeviceToken.id).all()
+
+@app.delete("/devices/{device_id}")
+async def revoke_device_token(
+    device_id: int,
+    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Revoke a device token; the device is rejected from its next request on"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    db_device = db.query(models.DeviceToken).filter(models.DeviceToken.id == device_id).first()
+    if not db_device:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Device token not found"
+        )
+    
+    if db_device.revoked_at is None:
+        db_device.is_active = False
+        db_device.revoked_at = datetime.utcnow()
+        db.commit()
+    
+    return {"message": f"Device token {db_device.token_prefix} has been revoked"}
+
 # Train Timetable Management Endpoints (Admin Only)
 @app.post("/trains", response_model=schemas.Train)
 async def create_train(
@@ -348,30 +501,41 @@ async def create_train(
 
 @app.get("/trains", response_model=list[schemas.Train])
 async def get_trains(
+    response: Response,
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     current_user: models.User = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
 ):
-    trains = db.query(models.Train).all()
-    return trains
+    # Load every train's stations in one extra query instead of one per train
+    query = db.query(models.Train).options(selectinload(models.Train.stations))
+    trains = paginate(query, models.Train, limit, cursor).all()
+    return page_response(trains, limit, response, schemas.Train, fields)
 
 @app.get("/trains/station/{station_code}", response_model=List[schemas.Train])
 async def get_trains_by_station(
     station_code: str,
-    current_user: models.User = Depends(auth.get_current_user),
-    db: Session = Depends(get_db)
+    current_user: models.User = Depends(auth.get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all trains that pass through a specific station"""
+    # Stations are serialized with each train and can't be lazy loaded on the async session
+    query = select(models.Train).options(selectinload(models.Train.stations))
     
     # If station_code is "ALL", return all trains
-    if station_code.upper() == "ALL":
-        trains = db.query(models.Train).all()
-    else:
-        # Find trains that have the specified station
-        trains = db.query(models.Train).join(models.Station).filter(
-            models.Station.station_code == station_code
-        ).all()
+    if station_code.upper() != "ALL":
+        # Find trains that have the specified station; IN rather than a join, so a train
+        # that stops at the station more than once is returned once, and the station
+        # code index is searched instead of probing every train
+        query = query.filter(
+            models.Train.id.in_(
+                select(models.Station.train_id).filter(models.Station.station_code == station_code)
+            )
+        )
     
-    return trains
+    result = await db.execute(query)
+    return result.scalars().all()
 
 @app.get("/trains/{train_id}", response_model=schemas.Train)
 async def get_train(
@@ -473,6 +637,13 @@ async def delete_train(
     return {"message": "Train deleted successfully"}
 
 # Station Master Management Endpoints (Admin Only)
+def queue_station_name_audio(db: Session, station_name: str, user_id: int):
+    """Queue pre-rendering of a station name in every language"""
+    try:
+        jobs.enqueue_job(db, "audio_library", {"values": [station_name]}, created_by=user_id)
+    except Exception as e:
+        print(f"⚠️  Warning: Failed to queue station name audio for {station_name}: {e}")
+
 @app.post("/stations", response_model=schemas.StationMaster)
 async def create_station(
     station: schemas.StationMasterCreate,
@@ -530,6 +701,7 @@ async def create_station(
             # Debug logging after creation
             print(f"✅ Created station: {db_station.station_name} with state: '{db_station.state}'")
             
+            queue_station_name_audio(db, db_station.station_name, current_user.id)
             return db_station
         except Exception as e:
             db.rollback()
@@ -555,12 +727,17 @@ async def create_station(
 
 @app.get("/stations", response_model=List[schemas.StationMaster])
 async def get_stations(
-    current_user: models.User = Depends(auth.get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: models.User = Depends(auth.get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all stations (available to all authenticated users)"""
-    stations = db.query(models.StationMaster).filter(models.StationMaster.is_active == True).all()
-    return stations
+    query = select(models.StationMaster).filter(models.StationMaster.is_active == True)
+    result = await db.execute(paginate(query, models.StationMaster, limit, cursor))
+    return page_response(result.scalars().all(), limit, response, schemas.StationMaster, fields)
 
 @app.get("/stations/{station_id}", response_model=schemas.StationMaster)
 async def get_station(
@@ -609,11 +786,14 @@ async def update_station(
             )
     
     # Update station fields
+    previous_name = db_station.station_name
     for field, value in station_update.dict(exclude_unset=True).items():
         setattr(db_station, field, value)
     
     db.commit()
     db.refresh(db_station)
+    if db_station.station_name != previous_name:
+        queue_station_name_audio(db, db_station.station_name, current_user.id)
     return db_station
 
 @app.delete("/stations/clear-all")
@@ -696,7 +876,8 @@ async def translate_announcement(
         )
     
     # Translate the announcement
-    translations = translation_service.translate_announcement(
+    translations = await executors.run_media(
+        translation_service.translate_announcement,
         request.english_text, 
         request.local_language
     )
@@ -848,8 +1029,9 @@ async def generate_audio(
             if hindi_text:
                 announcements['hi'] = hindi_text
         
-        # Generate multi-language audio
-        audio_content = audio_generator.generate_multi_language_audio(announcements)
+        # Synthesize on the media pool, then join the MP3 frames on the CPU pool
+        segments = await executors.run_media(audio_generator.synthesize_segments, announcements)
+        audio_content = await executors.run_cpu(concat_mp3, segments) if segments else b''
         
         # Check if audio content is valid
         if not audio_content or len(audio_content) == 0:
@@ -896,8 +1078,7 @@ async def generate_audio(
         print(f"🎵 Saving audio to: {audio_path}")
         
         try:
-            with open(audio_path, 'wb') as f:
-                f.write(audio_content)
+            await executors.run_media(write_bytes, audio_path, audio_content)
             
             # Try to set file permissions (may fail if not running as root)
             try:
@@ -1053,6 +1234,105 @@ async def cleanup_audio_files(
             detail=f"Error cleaning up audio files: {str(e)}"
         )
 
+# Worker Pool Metrics Endpoint (Admin Only)
+@app.get("/system/executors")
+async def get_executor_metrics(
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    """Get queue depth and saturation of the media, CPU and password worker pools (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return executors.get_metrics()
+
+# TTS Cache Endpoints (Admin Only)
+@app.get("/tts-cache/stats")
+async def get_tts_cache_stats(
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    """Get hit/miss counters for the synthesized audio cache (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return audio_generator.get_cache_stats()
+
+@app.delete("/tts-cache")
+async def clear_tts_cache(
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    """Remove every cached TTS result (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    audio_generator.cache.clear()
+    return {"message": "TTS cache cleared successfully"}
+
+@app.get("/translation-memory/stats")
+async def get_translation_memory_stats(
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    """Get hit ratios of the translation memory (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return await executors.run_media(translation_service.memory.stats)
+
+@app.delete("/translation-memory")
+async def invalidate_translation_memory(
+    text: Optional[str] = None,
+    language: Optional[str] = None,
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    """Invalidate stored translations of a text and/or language, or all of them (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    removed = await executors.run_media(translation_service.memory.invalidate, text, language)
+    return {"message": "Translation memory invalidated", "removed": removed}
+
+@app.post("/audio-library/prerender", response_model=schemas.JobSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def prerender_audio_library(
+    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Queue pre-rendering of numbers and station names in every language (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    job, deduplicated = jobs.enqueue_job(db, "audio_library", {}, created_by=current_user.id)
+    return {"job_id": job.id, "status": job.status, "deduplicated": deduplicated}
+
+@app.get("/audio-library/stats")
+async def get_audio_library_stats(
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    """Get clip counts and hit ratio of the value clip library (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return value_clip_library.stats()
+
 @app.post("/generate-isl-video")
 async def generate_isl_video(
     request: dict,
@@ -1065,88 +1345,126 @@ async def generate_isl_video(
         if not english_text:
             raise HTTPException(status_code=400, detail="English text is required")
         
-        # Create ISL videos directory if it doesn't exist
-        isl_videos_dir = "/var/www/html/isl_videos"
         try:
-            os.makedirs(isl_videos_dir, exist_ok=True)
-            # Set permissions for web server access
-            os.chmod(isl_videos_dir, 0o755)
-            # Try to set ownership to current user if possible
-            try:
-                import pwd
-                current_uid = os.getuid()
-                os.chown(isl_videos_dir, current_uid, -1)
-            except (ImportError, OSError):
-                pass  # Skip ownership change if not possible
-        except PermissionError:
-            # Fallback to backend directory if permission denied
-            isl_videos_dir = "isl_videos"
-            os.makedirs(isl_videos_dir, exist_ok=True)
-        
-        # Generate unique filename
-        import uuid
-        filename = f"isl_announcement_{uuid.uuid4().hex[:8]}.mp4"
-        output_path = os.path.join(isl_videos_dir, filename)
-        
-        # Generate audio files for all languages if requested
-        audio_files = {}
-        if request.get("include_audio", True):
-            try:
-                # Generate audio for each language
-                languages = {
-                    'english': 'en',
-                    'hindi': 'hi', 
-                    'marathi': 'mr',
-                    'gujarati': 'gu'
-                }
-                
-                for lang_name, lang_code in languages.items():
-                    # Generate audio using the audio generator
-                    audio_content = audio_generator.generate_audio(english_text, lang_code)
-                    
-                    # Save audio to temporary file
-                    temp_audio_path = f"/tmp/isl_audio_{lang_name}_{uuid.uuid4().hex[:8]}.mp3"
-                    with open(temp_audio_path, 'wb') as f:
-                        f.write(audio_content)
-                    
-                    audio_files[lang_name] = temp_audio_path
-                    print(f"Generated audio for {lang_name}: {temp_audio_path}")
-                
-            except Exception as e:
-                print(f"Error generating audio files: {e}")
-                # Continue without audio if there's an error
-        
-        # Generate ISL video with audio
-        result_path = isl_generator.generate_isl_video(english_text, output_path, audio_files)
-        
-        if not result_path:
+            result = await executors.run_media(
+                render_isl_announcement,
+                english_text,
+                request.get("include_audio", True)
+            )
+        except RuntimeError:
             raise HTTPException(status_code=500, detail="Failed to generate ISL video")
         
-        # Get file size
-        file_size = os.path.getsize(result_path) if os.path.exists(result_path) else 0
-        
-        # Clean up temporary audio files
-        for audio_path in audio_files.values():
-            try:
-                if os.path.exists(audio_path):
-                    os.unlink(audio_path)
-                    print(f"Cleaned up temporary audio file: {audio_path}")
-            except Exception as e:
-                print(f"Error cleaning up audio file {audio_path}: {e}")
-        
-        return {
-            "success": True,
-            "filename": filename,
-            "file_path": result_path,
-            "file_size": file_size,
-            "video_url": f"/isl-videos/{filename}"
-        }
+        return {"success": True, **result}
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating ISL video: {str(e)}")
 
+# ISL Dataset Endpoints (Admin Only)
+@app.post("/isl-dataset/rescan")
+async def rescan_isl_dataset(
+    full: bool = False,
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    """Refresh the ISL dataset index; full=true re-probes every clip (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    stats = await executors.run_media(isl_generator.rescan_dataset, full)
+    return {
+        "message": "ISL dataset index refreshed",
+        "total_words": len(isl_generator.available_videos),
+        **stats
+    }
+
+@app.post("/isl-phrases/rebuild", response_model=schemas.JobSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def rebuild_isl_phrases(
+    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Queue a rebuild of the precomposed ISL phrase clips (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    job, deduplicated = jobs.enqueue_job(db, "isl_phrases", {}, created_by=current_user.id)
+    return {"job_id": job.id, "status": job.status, "deduplicated": deduplicated}
+
+@app.get("/isl-video-cache/stats")
+async def get_isl_video_cache_stats(
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    """Get hit/miss counters for the rendered ISL video cache (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return isl_generator.video_cache.stats()
+
+@app.delete("/isl-video-cache")
+async def clear_isl_video_cache(
+    current_user: models.User = Depends(auth.get_current_user)
+):
+    """Remove every cached ISL video render (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    await executors.run_media(isl_generator.video_cache.clear)
+    return {"message": "ISL video cache cleared successfully"}
+
+# Background Job Endpoints
+@app.post("/jobs/isl-video", response_model=schemas.JobSubmitResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_isl_video_job(
+    request: schemas.ISLVideoJobRequest,
+    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Queue ISL video generation and return a job id to poll"""
+    english_text = request.english_text.strip()
+    if not english_text:
+        raise HTTPException(status_code=400, detail="English text is required")
+    
+    job, deduplicated = jobs.enqueue_job(
+        db,
+        "isl_video",
+        {"english_text": english_text, "include_audio": request.include_audio},
+        created_by=current_user.id
+    )
+    
+    return {"job_id": job.id, "status": job.status, "deduplicated": deduplicated}
+
+@app.get("/jobs/{job_id}", response_model=schemas.Job)
+async def get_job(
+    job_id: int,
+    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get status, progress and result of a background job"""
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    
+    # Users only see their own jobs; admins see every job, including system ones
+    if job and current_user.role != "admin" and job.created_by != current_user.id:
+        job = None
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    return job
+
 @app.get("/isl-videos/{filename}")
 async def serve_isl_video(filename: str):
     """Serve ISL video files (public endpoint for video playback)"""
@@ -1337,7 +1655,7 @@ async def create_audio_file(
         lang_code = language_map.get(audio_data.language, 'en')
         
         # Generate audio using existing audio generator
-        audio_content = audio_generator.generate_audio(audio_data.text_content, lang_code)
+        audio_content = await executors.run_media(audio_generator.generate_audio, audio_data.text_content, lang_code)
         
         # Create unique filename
         import uuid
@@ -1345,8 +1663,7 @@ async def create_audio_file(
         file_path = f"static/audio_db/{filename}"
         
         # Save audio file
-        with open(file_path, 'wb') as f:
-            f.write(audio_content)
+        await executors.run_media(write_bytes, file_path, audio_content)
         
         # Get file size
         file_size = len(audio_content)
@@ -1380,6 +1697,10 @@ async def create_audio_file(
 
 @app.get("/audio-files", response_model=List[schemas.AudioFile])
 async def get_audio_files(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     current_user: models.User = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -1391,8 +1712,9 @@ async def get_audio_files(
             detail="Not enough permissions"
         )
     
-    audio_files = db.query(models.AudioFile).filter(models.AudioFile.is_active == True).all()
-    return audio_files
+    query = db.query(models.AudioFile).filter(models.AudioFile.is_active == True)
+    audio_files = paginate(query, models.AudioFile, limit, cursor).all()
+    return page_response(audio_files, limit, response, schemas.AudioFile, fields)
 
 @app.get("/audio-files/{audio_id}", response_model=schemas.AudioFile)
 async def get_audio_file(
@@ -1567,20 +1889,27 @@ async def create_multi_language_audio(
         db.commit()
         db.refresh(db_audio)
         
-        # Generate translations and audio for each language
+        # Translate into every non-English language in one batch
+        translations = await executors.run_media(
+            translation_service.translate_batch,
+            [audio_data.original_text],
+            [lang['code'] for lang in languages if lang['code'] != 'en']
+        )
+        
+        # Generate audio for each language
         for lang in languages:
             try:
                 # Get translated text
                 if lang['code'] == 'en':
                     translated_text = audio_data.original_text
                 else:
-                    translated_text = translation_service.translate_text(audio_data.original_text, lang['code'])
+                    translated_text = translations[(audio_data.original_text, lang['code'])]
                     if not translated_text:
                         print(f"⚠️ Translation failed for {lang['name']}, using original text")
                         translated_text = audio_data.original_text
                 
                 # Generate audio
-                audio_content = audio_generator.generate_audio(translated_text, lang['code'])
+                audio_content = await executors.run_media(audio_generator.generate_audio, translated_text, lang['code'])
                 
                 # Create unique filename with language code
                 import uuid
@@ -1588,8 +1917,7 @@ async def create_multi_language_audio(
                 file_path = f"static/audio_db/{filename}"
                 
                 # Save audio file
-                with open(file_path, 'wb') as f:
-                    f.write(audio_content)
+                await executors.run_media(write_bytes, file_path, audio_content)
                 
                 # Get file size
                 file_size = len(audio_content)
@@ -1628,6 +1956,10 @@ async def create_multi_language_audio(
 
 @app.get("/multi-language-audio", response_model=List[schemas.MultiLanguageAudioFile])
 async def get_multi_language_audio_files(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     current_user: models.User = Depends(auth.get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -1639,10 +1971,11 @@ async def get_multi_language_audio_files(
             detail="Not enough permissions"
         )
     
-    audio_files = db.query(models.MultiLanguageAudioFile).filter(
+    query = db.query(models.MultiLanguageAudioFile).filter(
         models.MultiLanguageAudioFile.is_active == True
-    ).all()
-    return audio_files
+    )
+    audio_files = paginate(query, models.MultiLanguageAudioFile, limit, cursor).all()
+    return page_response(audio_files, limit, response, schemas.MultiLanguageAudioFile, fields)
 
 @app.get("/multi-language-audio/{audio_id}", response_model=schemas.MultiLanguageAudioFile)
 async def get_multi_language_audio_file(
@@ -1933,14 +2266,20 @@ async def create_announcement_template(
 
 @app.get("/announcement-templates", response_model=List[schemas.AnnouncementTemplate])
 async def get_announcement_templates(
-    current_user: models.User = Depends(auth.get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: models.User = Depends(auth.get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all announcement templates (available to all authenticated users)"""
-    templates = db.query(models.AnnouncementTemplate).filter(
-        models.AnnouncementTemplate.is_active == True
-    ).all()
-    return templates
+    query = select(models.AnnouncementTemplate).options(
+        selectinload(models.AnnouncementTemplate.creator),
+        selectinload(models.AnnouncementTemplate.placeholders)
+    ).filter(models.AnnouncementTemplate.is_active == True)
+    result = await db.execute(paginate(query, models.AnnouncementTemplate, limit, cursor))
+    return page_response(result.scalars().all(), limit, response, schemas.AnnouncementTemplate, fields)
 
 @app.get("/announcement-templates/{template_id}", response_model=schemas.AnnouncementTemplate)
 async def get_announcement_template(
@@ -2123,10 +2462,7 @@ async def generate_announcement(
     
     try:
         # Replace placeholders in template text
-        final_text = template.template_text
-        for placeholder_name, value in request.placeholder_values.items():
-            placeholder_pattern = f"{{{placeholder_name}}}"
-            final_text = final_text.replace(placeholder_pattern, str(value))
+        final_text = fill_placeholders(template.template_text, request.placeholder_values)
         
         # Create generated announcement record
         db_announcement = models.GeneratedAnnouncement(
@@ -2141,8 +2477,6 @@ async def generate_announcement(
         db.commit()
         db.refresh(db_announcement)
         
-        return db_announcement
-        
     except Exception as e:
         db.rollback()
         print(f"❌ Error generating announcement: {e}")
@@ -2150,25 +2484,250 @@ async def generate_announcement(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate announcement: {str(e)}"
         )
+    
+    # Push to the live streams of display screens
+    announcement_bus.publish(
+        db_announcement.station_code, db_announcement.id, announcement_event_data(db_announcement)
+    )
+    return db_announcement
+
+def announcement_event_data(announcement: models.GeneratedAnnouncement) -> str:
+    """Serialize an announcement once for every stream subscriber"""
+    return schemas.GeneratedAnnouncement.model_validate(announcement).model_dump_json()
+
+def select_generated_announcements():
+    """select() of active generated announcements with everything the response model reads"""
+    return select(models.GeneratedAnnouncement).options(
+        selectinload(models.GeneratedAnnouncement.creator),
+        selectinload(models.GeneratedAnnouncement.template).selectinload(models.AnnouncementTemplate.creator),
+        selectinload(models.GeneratedAnnouncement.template).selectinload(models.AnnouncementTemplate.placeholders)
+    ).filter(
+        models.GeneratedAnnouncement.is_active == True
+    )
 
 @app.get("/generated-announcements", response_model=List[schemas.GeneratedAnnouncement])
 async def get_generated_announcements(
-    current_user: models.User = Depends(auth.get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: models.User = Depends(auth.get_current_user_or_device_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all generated announcements (filtered by user's station if operator)"""
-    query = db.query(models.GeneratedAnnouncement).filter(
-        models.GeneratedAnnouncement.is_active == True
-    )
+    query = select_generated_announcements()
     
-    # If operator, only show announcements for their station or "ALL" station
-    if current_user.role == "operator" and current_user.station_code != "ALL":
+    # Operators and display devices only see announcements for their station
+    if current_user.role != "admin" and current_user.station_code != "ALL":
         query = query.filter(
             models.GeneratedAnnouncement.station_code == current_user.station_code
         )
     
-    announcements = query.all()
-    return announcements
+    # Pages run newest first, which the announcement history indexes serve directly
+    query = paginate(query, models.GeneratedAnnouncement, limit, cursor,
+                     sort_column=models.GeneratedAnnouncement.created_at, newest_first=True)
+    result = await db.execute(query)
+    return page_response(result.scalars().all(), limit, response, schemas.GeneratedAnnouncement, fields)
+
+@app.get("/stream/stations/{station_code}/announcements")
+async def stream_station_announcements(
+    station_code: str,
+    last_event_id: Optional[str] = Header(None),
+    current_user: models.User = Depends(auth.get_current_user_or_device_from_query_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stream announcements generated for a station as Server-Sent Events (ALL streams every station)"""
+    station_code = channel_for(station_code)
+    
+    # Operators and display devices only stream their own station
+    if (current_user.role != "admin" and current_user.station_code != "ALL"
+            and station_code != channel_for(current_user.station_code or "")):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    after_id = None
+    if last_event_id:
+        try:
+            after_id = int(last_event_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid Last-Event-ID"
+            )
+    
+    # Subscribe before reading the backlog so nothing generated in between is missed
+    subscriber = announcement_bus.subscribe(station_code)
+    try:
+        replay = []
+        if after_id is not None:
+            # Replay what the client missed while reconnecting, newest SSE_REPLAY_LIMIT at most
+            query = select_generated_announcements().filter(models.GeneratedAnnouncement.id > after_id)
+            if station_code != ALL_STATIONS:
+                # Matched like the live channels; the id range keeps this a short scan
+                query = query.filter(func.upper(models.GeneratedAnnouncement.station_code) == station_code)
+            result = await db.execute(query.order_by(models.GeneratedAnnouncement.id.desc()).limit(SSE_REPLAY_LIMIT))
+            replay = [(row.id, announcement_event_data(row)) for row in reversed(result.scalars().all())]
+        # Streams stay open for hours, so don't keep a pooled connection checked out for them
+        await db.close()
+    except BaseException:
+        announcement_bus.unsubscribe(subscriber)
+        raise
+    
+    return StreamingResponse(
+        stream_events(announcement_bus, subscriber, replay),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def parse_language_codes(languages: Optional[str]) -> List[str]:
+    """Parse a comma-separated language code list, defaulting to every template language"""
+    if not languages:
+        return TEMPLATE_LANGUAGES
+    return [code.strip() for code in languages.split(",") if code.strip()]
+
+def get_visible_generated_announcement(db: Session, announcement_id: int, current_user: models.User) -> models.GeneratedAnnouncement:
+    """Fetch an active generated announcement the user may see, or raise 404"""
+    announcement = db.query(models.GeneratedAnnouncement).filter(
+        models.GeneratedAnnouncement.id == announcement_id,
+        models.GeneratedAnnouncement.is_active == True
+    ).first()
+    
+    # Operators and display devices only see announcements for their station
+    if announcement and current_user.role != "admin" and current_user.station_code != "ALL":
+        if announcement.station_code != current_user.station_code:
+            announcement = None
+    
+    if not announcement:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Generated announcement not found"
+        )
+    return announcement
+
+@app.get("/announcement-templates/{template_id}/translations", response_model=schemas.TemplateTranslations)
+async def get_announcement_template_translations(
+    template_id: int,
+    languages: Optional[str] = None,
+    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the translated skeletons of a template, translating missing languages once"""
+    template = db.query(models.AnnouncementTemplate).filter(
+        models.AnnouncementTemplate.id == template_id,
+        models.AnnouncementTemplate.is_active == True
+    ).first()
+    
+    if not template:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Announcement template not found"
+        )
+    
+    skeletons = await executors.run_media(get_template_skeletons, db, template, parse_language_codes(languages))
+    return schemas.TemplateTranslations(
+        template_id=template.id,
+        template_text=template.template_text,
+        skeletons=skeletons
+    )
+
+@app.get("/generated-announcements/{announcement_id}/translations", response_model=schemas.GeneratedAnnouncementTranslations)
+async def get_generated_announcement_translations(
+    announcement_id: int,
+    languages: Optional[str] = None,
+    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Translate a generated announcement by filling its template's translated skeletons"""
+    announcement = get_visible_generated_announcement(db, announcement_id, current_user)
+    
+    translations = await executors.run_media(
+        translate_announcement_values,
+        db,
+        announcement.template,
+        json.loads(announcement.placeholder_values),
+        parse_language_codes(languages)
+    )
+    return schemas.GeneratedAnnouncementTranslations(
+        announcement_id=announcement.id,
+        english=announcement.final_text,
+        translations=translations
+    )
+
+@app.post("/generated-announcements/{announcement_id}/audio", response_model=schemas.GeneratedAnnouncement)
+async def generate_announcement_audio(
+    announcement_id: int,
+    languages: Optional[str] = None,
+    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Generate audio for a generated announcement from cached template fragments and value clips.
+    
+    Languages are spoken in the given order (default: en, hi, mr, gu).
+    """
+    announcement = get_visible_generated_announcement(db, announcement_id, current_user)
+    template = announcement.template
+    language_codes = parse_language_codes(languages) if languages else ['en'] + TEMPLATE_LANGUAGES
+    
+    # English uses the template itself; other languages use its translated skeletons
+    translated = await executors.run_media(
+        get_template_skeletons, db, template, [code for code in language_codes if code != 'en']
+    )
+    skeletons = {}
+    for code in language_codes:
+        skeleton = template.template_text if code == 'en' else translated.get(code)
+        if skeleton:
+            skeletons[code] = skeleton
+        else:
+            print(f"⚠️ No {code} translation of template {template.id}, skipping language")
+    
+    placeholder_values = json.loads(announcement.placeholder_values)
+    segments = await executors.run_media(segmented_audio.render_segments, skeletons, placeholder_values)
+    if not segments:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Generated audio content is empty"
+        )
+    audio_content = await executors.run_cpu(concat_mp3, segments)
+    
+    import uuid
+    filename = f"generated_{announcement.id}_{uuid.uuid4().hex[:8]}.mp3"
+    file_path = f"static/audio_db/{filename}"
+    await executors.run_media(write_bytes, file_path, audio_content)
+    
+    # Replace any previous rendering of this announcement
+    previous_path = announcement.audio_file_path
+    announcement.audio_file_path = file_path
+    announcement.filename = filename
+    announcement.file_size = len(audio_content)
+    db.commit()
+    db.refresh(announcement)
+    if previous_path and previous_path != file_path and os.path.exists(previous_path):
+        os.unlink(previous_path)
+    
+    print(f"✅ Generated announcement audio from {len(segments)} segments: {filename}")
+    return announcement
+
+@app.get("/generated-announcements/{announcement_id}/play")
+async def play_generated_announcement_audio(
+    announcement_id: int,
+    current_user: models.User = Depends(auth.get_current_user_or_device),
+    db: Session = Depends(get_db)
+):
+    """Serve the audio file of a generated announcement"""
+    announcement = get_visible_generated_announcement(db, announcement_id, current_user)
+    if not announcement.audio_file_path or not os.path.exists(announcement.audio_file_path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Announcement audio file not found"
+        )
+    
+    return FileResponse(
+        announcement.audio_file_path,
+        media_type="audio/mpeg",
+        filename=announcement.filename
+    )
 
 @app.get("/announcement-templates/{template_id}/play")
 async def play_template_audio(
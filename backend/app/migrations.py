@@ -0,0 +1,68 @@
+from typing import Callable, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from . import models
+from .database import engine
+
+# Composite indexes matching the filters of the list and lookup queries in main.py.
+# The same indexes are declared on the models, so new databases get them from create_all.
+QUERY_INDEXES = [
+    ("ix_stations_station_code_train_id", "stations", ("station_code", "train_id")),
+    ("ix_stations_train_id_sequence_order", "stations", ("train_id", "sequence_order")),
+    ("ix_station_master_is_active_id", "station_master", ("is_active", "id")),
+    ("ix_audio_files_is_active_id", "audio_files", ("is_active", "id")),
+    ("ix_multi_language_audio_files_is_active_id", "multi_language_audio_files", ("is_active", "id")),
+    ("ix_multi_language_audio_versions_parent_language", "multi_language_audio_versions",
+     ("parent_audio_id", "language_code")),
+    ("ix_announcement_templates_is_active_id", "announcement_templates", ("is_active", "id")),
+    ("ix_template_placeholders_template_id", "template_placeholders", ("template_id",)),
+    ("ix_generated_announcements_is_active_created_at", "generated_announcements", ("is_active", "created_at")),
+    ("ix_generated_announcements_station_active_created_at", "generated_announcements",
+     ("station_code", "is_active", "created_at")),
+]
+
+def add_query_indexes(connection: Connection):
+    for name, table, columns in QUERY_INDEXES:
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+    # Refresh planner statistics so the new indexes are used right away
+    connection.execute(text("ANALYZE"))
+
+# Versioned schema changes, applied in order and recorded in schema_migrations.
+# Append new migrations at the end; never renumber or edit applied ones.
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "add_query_indexes", add_query_indexes),
+]
+
+def applied_versions(bind: Engine = engine) -> List[int]:
+    with bind.connect() as connection:
+        return [row[0] for row in connection.execute(text("SELECT version FROM schema_migrations"))]
+
+def run_pending_migrations(bind: Engine = engine) -> List[int]:
+    """Apply migrations missing from schema_migrations and return their versions.
+
+    Each migration runs in its own transaction together with its
+    schema_migrations row, so an interrupted run is retried on the next start.
+    """
+    models.SchemaMigration.__table__.create(bind=bind, checkfirst=True)
+    done = set(applied_versions(bind))
+    applied = []
+    for version, name, migrate in MIGRATIONS:
+        if version in done:
+            continue
+        print(f"🔄 Applying migration {version}: {name}")
+        try:
+            with bind.begin() as connection:
+                migrate(connection)
+                connection.execute(
+                    models.SchemaMigration.__table__.insert().values(version=version, name=name)
+                )
+        except IntegrityError:
+            # Another API node applied the same migration first
+            print(f"✅ Migration {version} was applied by another process")
+            continue
+        applied.append(version)
+        print(f"✅ Applied migration {version}: {name}")
+    return applied
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Time
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Time, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .database import Base
@@ -32,6 +32,11 @@ class Train(Base):
 
 class Station(Base):
     __tablename__ = "stations"
+    __table_args__ = (
+        # Trains calling at a station, and each train's stations in order
+        Index("ix_stations_station_code_train_id", "station_code", "train_id"),
+        Index("ix_stations_train_id_sequence_order", "train_id", "sequence_order"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     train_id = Column(Integer, ForeignKey("trains.id"), nullable=False)
@@ -45,6 +50,9 @@ class Station(Base):
 
 class StationMaster(Base):
     __tablename__ = "station_master"
+    __table_args__ = (
+        Index("ix_station_master_is_active_id", "is_active", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     station_name = Column(String, nullable=False)
@@ -67,6 +75,9 @@ class StateLanguageMapping(Base):
 
 class AudioFile(Base):
     __tablename__ = "audio_files"
+    __table_args__ = (
+        Index("ix_audio_files_is_active_id", "is_active", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -87,6 +98,9 @@ class AudioFile(Base):
 
 class MultiLanguageAudioFile(Base):
     __tablename__ = "multi_language_audio_files"
+    __table_args__ = (
+        Index("ix_multi_language_audio_files_is_active_id", "is_active", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -104,6 +118,9 @@ class MultiLanguageAudioFile(Base):
 
 class MultiLanguageAudioVersion(Base):
     __tablename__ = "multi_language_audio_versions"
+    __table_args__ = (
+        Index("ix_multi_language_audio_versions_parent_language", "parent_audio_id", "language_code"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     parent_audio_id = Column(Integer, ForeignKey("multi_language_audio_files.id"), nullable=False)
@@ -123,6 +140,9 @@ class MultiLanguageAudioVersion(Base):
 
 class AnnouncementTemplate(Base):
     __tablename__ = "announcement_templates"
+    __table_args__ = (
+        Index("ix_announcement_templates_is_active_id", "is_active", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -144,6 +164,9 @@ class AnnouncementTemplate(Base):
 
 class TemplatePlaceholder(Base):
     __tablename__ = "template_placeholders"
+    __table_args__ = (
+        Index("ix_template_placeholders_template_id", "template_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     template_id = Column(Integer, ForeignKey("announcement_templates.id"), nullable=False)
@@ -158,6 +181,11 @@ class TemplatePlaceholder(Base):
 
 class GeneratedAnnouncement(Base):
     __tablename__ = "generated_announcements"
+    __table_args__ = (
+        # Announcement history, newest first, for everyone and for an operator's station
+        Index("ix_generated_announcements_is_active_created_at", "is_active", "created_at"),
+        Index("ix_generated_announcements_station_active_created_at", "station_code", "is_active", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     template_id = Column(Integer, ForeignKey("announcement_templates.id"), nullable=False)
@@ -176,4 +204,87 @@ class GeneratedAnnouncement(Base):
     
     # Relationship to user and template
     creator = relationship("User")
-    template = relationship("AnnouncementTemplate") 
\ No newline at end of file
+    template = relationship("AnnouncementTemplate") 
+
+class DeviceToken(Base):
+    __tablename__ = "device_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)  # e.g. 'NDLS platform 1 display'
+    station_code = Column(String, nullable=False)  # Station whose announcements the device may read
+    token_prefix = Column(String, unique=True, index=True, nullable=False)  # Public part used to look the token up
+    token_hash = Column(String, nullable=False)  # HMAC-SHA256 of the secret part
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), nullable=True)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationship to user
+    creator = relationship("User")
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    jti = Column(String, unique=True, index=True, nullable=False)  # Token id carried in the refresh JWT
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)  # Set when rotated or revoked
+
+class SchemaMigration(Base):
+    __tablename__ = "schema_migrations"
+
+    version = Column(Integer, primary_key=True)  # Position in app.migrations.MIGRATIONS
+    name = Column(String, nullable=False)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String, nullable=False)  # 'isl_video'
+    dedup_key = Column(String, nullable=False, index=True)  # Hash of job type and payload
+    payload = Column(String, nullable=False)  # JSON string of job parameters
+    status = Column(String, nullable=False, default="queued", index=True)  # 'queued', 'running', 'completed', 'failed'
+    progress = Column(Integer, nullable=False, default=0)  # Percentage complete
+    message = Column(String, nullable=True)  # Current stage description
+    result = Column(String, nullable=True)  # JSON string of job result
+    error = Column(String, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String, nullable=True)  # Worker currently processing the job
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class TranslationMemoryEntry(Base):
+    __tablename__ = "translation_memory"
+    __table_args__ = (
+        UniqueConstraint("source_hash", "target_language", "engine_version", name="uq_translation_memory_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_hash = Column(String, nullable=False, index=True)  # Hash of the normalized source text
+    source_text = Column(String, nullable=False)  # Normalized source text
+    target_language = Column(String, nullable=False)  # Language code, e.g. 'hi'
+    engine_version = Column(String, nullable=False)  # Translation engine that produced the text
+    translated_text = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class TemplateTranslation(Base):
+    __tablename__ = "template_translations"
+    __table_args__ = (
+        UniqueConstraint("template_id", "language_code", name="uq_template_translation_language"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    template_id = Column(Integer, ForeignKey("announcement_templates.id"), nullable=False, index=True)
+    language_code = Column(String, nullable=False)  # 'hi', 'mr', 'gu'
+    source_hash = Column(String, nullable=False)  # Hash of the template text this was translated from
+    engine_version = Column(String, nullable=False)
+    skeleton_text = Column(String, nullable=False)  # Translated text with {placeholder} tokens intact
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
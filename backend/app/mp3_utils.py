@@ -0,0 +1,149 @@
+from typing import List, Optional, NamedTuple
+
+# Bitrates in kbps, indexed by [version group][layer][bitrate index]
+_BITRATES = {
+    'v1': {
+        1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+        2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+        3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    },
+    'v2': {
+        1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+        2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+        3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    },
+}
+
+# Sample rates in Hz, indexed by MPEG version bits
+_SAMPLE_RATES = {
+    0b11: [44100, 48000, 32000],  # MPEG 1
+    0b10: [22050, 24000, 16000],  # MPEG 2
+    0b00: [11025, 12000, 8000],   # MPEG 2.5
+}
+
+_LAYERS = {0b11: 1, 0b10: 2, 0b01: 3}
+
+class FrameHeader(NamedTuple):
+    version: int  # Raw version bits: 0b11 MPEG1, 0b10 MPEG2, 0b00 MPEG2.5
+    layer: int
+    sample_rate: int
+    channel_mode: int
+    frame_length: int
+
+def parse_frame_header(data: bytes, offset: int) -> Optional[FrameHeader]:
+    """Parse the MPEG audio frame header at offset, or return None if there is none"""
+    if offset + 4 > len(data):
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version = (b1 >> 3) & 0x03
+    layer = _LAYERS.get((b1 >> 1) & 0x03)
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0x03
+    padding = (b2 >> 1) & 0x01
+    channel_mode = (b3 >> 6) & 0x03
+
+    # Reserved version/layer values, free-format and invalid bitrates, reserved sample rate
+    if version == 0b01 or layer is None:
+        return None
+    if bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    group = 'v1' if version == 0b11 else 'v2'
+    bitrate = _BITRATES[group][layer][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][sample_rate_index]
+
+    if layer == 1:
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 3 and version != 0b11:
+        frame_length = 72 * bitrate // sample_rate + padding
+    else:
+        frame_length = 144 * bitrate // sample_rate + padding
+
+    return FrameHeader(version, layer, sample_rate, channel_mode, frame_length)
+
+def _skip_id3v2(data: bytes) -> int:
+    """Return the offset of the first byte after any leading ID3v2 tags"""
+    offset = 0
+    while data[offset:offset + 3] == b'ID3' and offset + 10 <= len(data):
+        flags = data[offset + 5]
+        size_bytes = data[offset + 6:offset + 10]
+        size = 0
+        for byte in size_bytes:
+            size = (size << 7) | (byte & 0x7F)
+        offset += 10 + size + (10 if flags & 0x10 else 0)
+    return offset
+
+def _audio_end(data: bytes) -> int:
+    """Return the end of the audio data, excluding a trailing ID3v1 tag"""
+    if len(data) >= 128 and data[-128:-125] == b'TAG':
+        return len(data) - 128
+    return len(data)
+
+def _is_info_frame(data: bytes, offset: int, header: FrameHeader) -> bool:
+    """Check whether the frame at offset is a Xing/Info or VBRI metadata frame"""
+    mono = header.channel_mode == 0b11
+    if header.version == 0b11:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+    xing_offset = offset + 4 + side_info
+    if data[xing_offset:xing_offset + 4] in (b'Xing', b'Info'):
+        return True
+    return data[offset + 36:offset + 40] == b'VBRI'
+
+def iter_frames(data: bytes):
+    """Yield (header, frame bytes) for every audio frame in an MP3 byte stream"""
+    offset = _skip_id3v2(data)
+    end = _audio_end(data)
+    synced = False
+
+    while offset + 4 <= end:
+        header = parse_frame_header(data, offset)
+        if header is None or offset + header.frame_length > end:
+            # Resynchronize on the next frame sync word
+            offset += 1
+            synced = False
+            continue
+
+        # After junk data, guard against false sync words by checking the next frame
+        next_offset = offset + header.frame_length
+        if not synced and next_offset + 4 <= end and parse_frame_header(data, next_offset) is None:
+            offset += 1
+            continue
+
+        yield header, data[offset:next_offset]
+        offset = next_offset
+        synced = True
+
+def concat_mp3(segments: List[bytes]) -> bytes:
+    """Join MP3 byte streams by appending their audio frames.
+
+    ID3 tags and Xing/Info/VBRI metadata frames are dropped, since their
+    frame counts would describe only the first segment. All segments must
+    share the same MPEG version, layer and sample rate.
+    """
+    output = bytearray()
+    stream_format = None
+
+    for index, segment in enumerate(segments):
+        frame_count = 0
+        for position, (header, frame) in enumerate(iter_frames(segment)):
+            if position == 0 and _is_info_frame(frame, 0, header):
+                continue
+
+            segment_format = (header.version, header.layer, header.sample_rate)
+            if stream_format is None:
+                stream_format = segment_format
+            elif segment_format != stream_format:
+                raise ValueError(f"Audio segment {index} uses a different MP3 encoding than the first segment")
+
+            output.extend(frame)
+            frame_count += 1
+
+        if frame_count == 0:
+            raise ValueError(f"Audio segment {index} contains no MP3 frames")
+
+    return bytes(output)
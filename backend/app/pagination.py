@@ -0,0 +1,98 @@
+import os
+import json
+import base64
+import binascii
+from functools import lru_cache
+from typing import List, Optional, Type
+
+from fastapi import HTTPException, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import and_, or_, select
+
+# Largest page a client may request with ?limit=
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", "500"))
+
+# Page size of collections that grow without bound when ?limit= is omitted
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", "100"))
+
+# Response header carrying the cursor of the next page; absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"id": last_id}).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded.encode()))["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        last_id = None
+    if not isinstance(last_id, int):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return last_id
+
+def paginate(query, model, limit: Optional[int], cursor: Optional[str], sort_column=None, newest_first: bool = False):
+    """Apply keyset pagination to a Query or select() over model.
+
+    Rows are ordered by ``sort_column`` (if given) with the id as tie-breaker,
+    and the page starts after the row named by the cursor. One row more than
+    ``limit`` is fetched so page_response can tell whether another page follows.
+    Without a limit the query is returned unchanged and lists everything.
+    """
+    if limit is None:
+        if cursor is not None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="cursor requires limit")
+        return query
+
+    order = [column.desc() if newest_first else column.asc() for column in (sort_column, model.id) if column is not None]
+    if cursor is not None:
+        last_id = decode_cursor(cursor)
+        after = model.id < last_id if newest_first else model.id > last_id
+        if sort_column is not None:
+            # Compare against the cursor row's own value in SQL, so no timestamp round-trips through the client
+            last_value = select(sort_column).where(model.id == last_id).scalar_subquery()
+            beyond = sort_column < last_value if newest_first else sort_column > last_value
+            after = or_(beyond, and_(sort_column == last_value, after))
+        query = query.filter(after)
+    return query.order_by(*order).limit(limit + 1)
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[List[str]]:
+    """Parse a comma-separated ?fields= list, rejecting names the schema doesn't have"""
+    if not fields:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return names
+
+@lru_cache(maxsize=None)
+def field_adapter(schema: Type[BaseModel], name: str) -> TypeAdapter:
+    return TypeAdapter(schema.model_fields[name].annotation)
+
+def serialize_fields(row, schema: Type[BaseModel], names: List[str]) -> dict:
+    """Serialize only the named fields of a row, leaving other relationships unloaded"""
+    content = {}
+    for name in names:
+        adapter = field_adapter(schema, name)
+        content[name] = adapter.dump_python(adapter.validate_python(getattr(row, name), from_attributes=True), mode="json")
+    return content
+
+def page_response(rows: list, limit: Optional[int], response: Response, schema: Type[BaseModel],
+                  fields: Optional[str] = None):
+    """Trim the look-ahead row, set the next-page cursor and apply sparse field selection"""
+    names = parse_fields(fields, schema)
+    headers = {}
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].id)
+
+    if names is None:
+        response.headers.update(headers)
+        return rows
+    # Bypass the endpoint's response model, which would fill in every other field
+    return JSONResponse(content=[serialize_fields(row, schema, names) for row in rows], headers=headers)
@@ -1,3 +1,4 @@
+import json
 from pydantic import BaseModel, EmailStr, validator
 from typing import Optional, List
 from datetime import datetime, time
@@ -38,6 +39,15 @@ class Token(BaseModel):
     access_token: str
     token_type: str
     user: User
+    refresh_token: Optional[str] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class RefreshResponse(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str
 
 class TokenData(BaseModel):
     email: Optional[str] = None
@@ -297,4 +307,67 @@ class GeneratedAnnouncement(GeneratedAnnouncementBase):
 class AnnouncementGenerationRequest(BaseModel):
     template_id: int
     placeholder_values: dict  # Dictionary of placeholder values
-    title: Optional[str] = None 
\ No newline at end of file
+    title: Optional[str] = None 
+
+class TemplateTranslations(BaseModel):
+    template_id: int
+    template_text: str
+    skeletons: dict  # Language code -> translated text with {placeholder} tokens, or None
+
+class GeneratedAnnouncementTranslations(BaseModel):
+    announcement_id: int
+    english: str
+    translations: dict  # Language code -> translated text, or None if translation failed
+
+# Background Job schemas
+class ISLVideoJobRequest(BaseModel):
+    english_text: str
+    include_audio: bool = True
+
+class Job(BaseModel):
+    id: int
+    job_type: str
+    status: str  # 'queued', 'running', 'completed', 'failed'
+    progress: int
+    message: Optional[str] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+    @validator('result', pre=True)
+    def parse_result(cls, v):
+        if isinstance(v, str):
+            return json.loads(v)
+        return v
+
+class JobSubmitResponse(BaseModel):
+    job_id: int
+    status: str
+    deduplicated: bool = False
+
+# Device token schemas
+class DeviceTokenCreate(BaseModel):
+    name: str
+    station_code: str
+
+class DeviceToken(BaseModel):
+    id: int
+    name: str
+    station_code: str
+    token_prefix: str
+    created_by: int
+    is_active: bool
+    created_at: datetime
+    last_used_at: Optional[datetime] = None
+    revoked_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class DeviceTokenCreated(DeviceToken):
+    token: str  # Only returned when the device token is created
@@ -0,0 +1,132 @@
+import re
+import html
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from . import models
+from .disk_cache import make_cache_key
+from .translation import translation_service, TRANSLATION_ENGINE_VERSION
+
+# Languages template skeletons are translated into
+TEMPLATE_LANGUAGES = ['hi', 'mr', 'gu']
+
+PLACEHOLDER_PATTERN = re.compile(r"\{([^{}]+)\}")
+# Google may add spaces around the protected token, so match loosely
+PROTECTED_TOKEN_PATTERN = re.compile(r'<span translate="no">\s*(\d+)\s*</span>')
+
+def fill_placeholders(text: str, values: Dict) -> str:
+    """Substitute {name} placeholders with their values, leaving unknown ones untouched"""
+    return PLACEHOLDER_PATTERN.sub(
+        lambda match: str(values[match.group(1)]) if match.group(1) in values else match.group(0),
+        text
+    )
+
+def protect_placeholders(template_text: str) -> Tuple[str, List[str]]:
+    """Turn a template into HTML where each placeholder is an untranslatable token"""
+    names = []
+
+    def protect(match):
+        names.append(match.group(1))
+        return f'<span translate="no">{len(names) - 1}</span>'
+
+    return PLACEHOLDER_PATTERN.sub(protect, html.escape(template_text, quote=False)), names
+
+def restore_placeholders(translated_html: str, names: List[str]) -> Optional[str]:
+    """Turn a translated protected template back into a skeleton with {name} placeholders.
+
+    Returns None if the translation lost or duplicated a placeholder token.
+    """
+    seen = []
+
+    def restore(match):
+        index = int(match.group(1))
+        seen.append(index)
+        return f"{{{names[index]}}}" if index < len(names) else match.group(0)
+
+    skeleton = PROTECTED_TOKEN_PATTERN.sub(restore, translated_html)
+    if sorted(seen) != list(range(len(names))):
+        return None
+    return html.unescape(skeleton)
+
+def get_template_skeletons(
+    db: Session,
+    template: models.AnnouncementTemplate,
+    language_codes: Iterable[str] = TEMPLATE_LANGUAGES
+) -> Dict[str, Optional[str]]:
+    """Return translated skeletons of a template, translating only missing or outdated ones.
+
+    Skeletons are stored per language and reused until the template text or the
+    translation engine changes. A language maps to None if it can't be translated.
+    """
+    language_codes = list(dict.fromkeys(language_codes))
+    source_hash = make_cache_key(template.template_text)
+    stored = {
+        row.language_code: row
+        for row in db.query(models.TemplateTranslation).filter(
+            models.TemplateTranslation.template_id == template.id,
+            models.TemplateTranslation.language_code.in_(language_codes)
+        ).all()
+    }
+
+    skeletons = {}
+    missing = []
+    for language_code in language_codes:
+        row = stored.get(language_code)
+        if row and row.source_hash == source_hash and row.engine_version == TRANSLATION_ENGINE_VERSION:
+            skeletons[language_code] = row.skeleton_text
+        else:
+            missing.append(language_code)
+    if not missing:
+        return skeletons
+
+    protected, names = protect_placeholders(template.template_text)
+    translations = translation_service.translate_batch([protected], missing, format_='html')
+    for language_code in missing:
+        translated = translations[(protected, language_code)]
+        skeleton = restore_placeholders(translated, names) if translated else None
+        skeletons[language_code] = skeleton
+        if skeleton is None:
+            print(f"⚠️ Could not translate template {template.id} to {language_code} with placeholders intact")
+            continue
+
+        row = stored.get(language_code)
+        if row is None:
+            db.add(models.TemplateTranslation(
+                template_id=template.id,
+                language_code=language_code,
+                source_hash=source_hash,
+                engine_version=TRANSLATION_ENGINE_VERSION,
+                skeleton_text=skeleton
+            ))
+        else:
+            row.source_hash = source_hash
+            row.engine_version = TRANSLATION_ENGINE_VERSION
+            row.skeleton_text = skeleton
+    db.commit()
+    return skeletons
+
+def translate_announcement_values(
+    db: Session,
+    template: models.AnnouncementTemplate,
+    placeholder_values: Dict,
+    language_codes: Iterable[str] = TEMPLATE_LANGUAGES
+) -> Dict[str, Optional[str]]:
+    """Translate a generated announcement by filling the template's translated skeletons.
+
+    Placeholder values never reach the translator. Languages without a usable
+    skeleton fall back to translating the filled-in English text.
+    """
+    skeletons = get_template_skeletons(db, template, language_codes)
+    translations = {
+        language_code: fill_placeholders(skeleton, placeholder_values)
+        for language_code, skeleton in skeletons.items() if skeleton is not None
+    }
+
+    fallback = [language_code for language_code, skeleton in skeletons.items() if skeleton is None]
+    if fallback:
+        final_text = fill_placeholders(template.template_text, placeholder_values)
+        batch = translation_service.translate_batch([final_text], fallback)
+        for language_code in fallback:
+            translations[language_code] = batch[(final_text, language_code)]
+    return translations
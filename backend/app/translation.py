@@ -1,6 +1,16 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from google.cloud import translate_v2 as translate
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .translation_memory import TranslationMemory, normalize_source_text
+
+# The v2 API accepts at most 128 text segments per request
+TRANSLATE_MAX_SEGMENTS = 128
+TRANSLATE_MAX_PARALLEL_REQUESTS = int(os.getenv("TRANSLATE_MAX_PARALLEL_REQUESTS", "4"))
+
+# Bump to invalidate stored translations when the engine or model changes
+TRANSLATION_ENGINE_VERSION = os.getenv("TRANSLATION_ENGINE_VERSION", "google-translate-v2")
 
 class TranslationService:
     def __init__(self):
@@ -13,6 +23,76 @@ class TranslationService:
         else:
             print("Warning: Google Cloud credentials file not found at", credentials_path)
             self.client = None
+        self.memory = TranslationMemory(TRANSLATION_ENGINE_VERSION)
+
+    def _translate_chunk(self, texts: List[str], target_language: str, format_: str = 'text') -> List[Optional[str]]:
+        """Translate a list of texts into one language with a single API request"""
+        try:
+            results = self.client.translate(texts, target_language=target_language, format_=format_)
+            return [result['translatedText'] for result in results]
+        except Exception as e:
+            print(f"Translation error ({target_language}): {e}")
+            return [None] * len(texts)
+
+    def translate_batch(self, texts: Iterable[str], target_languages: Iterable[str],
+                        format_: str = 'text') -> Dict[Tuple[str, str], Optional[str]]:
+        """
+        Translate every text into every target language with as few API requests as possible
+        
+        The v2 API translates a list of texts into one target language per request,
+        so one request is made per language (and per 128 texts), and requests for
+        different languages are sent concurrently. Pairs found in the translation
+        memory are not sent at all.
+        
+        Args:
+            texts: Texts to translate
+            target_languages: Target language codes (e.g., 'hi', 'gu', 'mr')
+            format_: 'text', or 'html' to keep markup such as notranslate spans intact
+            
+        Returns:
+            Dictionary keyed by (text, target_language) with the translated text,
+            or None where translation failed
+        """
+        texts = list(dict.fromkeys(texts))
+        target_languages = list(dict.fromkeys(target_languages))
+        if not texts or not target_languages:
+            return {}
+        
+        # Previously translated pairs come from the translation memory
+        normalized = {text: normalize_source_text(text) for text in texts}
+        keys = [(source, language) for source in dict.fromkeys(normalized.values()) for language in target_languages]
+        known = self.memory.get_many(keys)
+        missing = [key for key in keys if key not in known]
+        
+        if missing and not self.client:
+            print("Translation service not available - credentials not found")
+        elif missing:
+            pending = {}
+            for source, language in missing:
+                pending.setdefault(language, []).append(source)
+            requests = [
+                (sources[start:start + TRANSLATE_MAX_SEGMENTS], language, format_)
+                for language, sources in pending.items()
+                for start in range(0, len(sources), TRANSLATE_MAX_SEGMENTS)
+            ]
+            if len(requests) == 1:
+                responses = [self._translate_chunk(*requests[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(len(requests), TRANSLATE_MAX_PARALLEL_REQUESTS)) as executor:
+                    responses = list(executor.map(lambda request: self._translate_chunk(*request), requests))
+            
+            translated = {}
+            for (chunk, language, _), results in zip(requests, responses):
+                for source, translated_text in zip(chunk, results):
+                    if translated_text:
+                        translated[(source, language)] = translated_text
+            self.memory.put_many(translated)
+            known.update(translated)
+        
+        return {
+            (text, language): known.get((normalized[text], language))
+            for text in texts for language in target_languages
+        }
 
     def translate_text(self, text: str, target_language: str) -> Optional[str]:
         """
@@ -25,16 +105,7 @@ class TranslationService:
         Returns:
             Translated text or None if translation fails
         """
-        if not self.client:
-            print("Translation service not available - credentials not found")
-            return None
-            
-        try:
-            result = self.client.translate(text, target_language=target_language)
-            return result['translatedText']
-        except Exception as e:
-            print(f"Translation error: {e}")
-            return None
+        return self.translate_batch([text], [target_language])[(text, target_language)]
 
     def translate_announcement(self, english_text: str, local_language: str) -> Dict[str, str]:
         """
@@ -60,20 +131,16 @@ class TranslationService:
             'Marathi': 'mr'
         }
         
-        # Translate to Hindi
-        hindi_code = language_codes.get('Hindi')
-        if hindi_code:
-            hindi_translation = self.translate_text(english_text, hindi_code)
-            if hindi_translation:
-                translations['hindi'] = hindi_translation
+        # Translate to Hindi and the local language (if different from Hindi) in one batch
+        target_codes = {'hindi': language_codes['Hindi']}
+        if local_language != 'Hindi' and language_codes.get(local_language):
+            target_codes['local'] = language_codes[local_language]
         
-        # Translate to local language (if different from Hindi)
-        if local_language != 'Hindi':
-            local_code = language_codes.get(local_language)
-            if local_code:
-                local_translation = self.translate_text(english_text, local_code)
-                if local_translation:
-                    translations['local'] = local_translation
+        batch = self.translate_batch([english_text], target_codes.values())
+        for key, code in target_codes.items():
+            translated_text = batch[(english_text, code)]
+            if translated_text:
+                translations[key] = translated_text
         
         return translations
 
@@ -0,0 +1,195 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from . import models
+from .database import SessionLocal
+from .disk_cache import make_cache_key
+
+# Translation memory configuration
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "4096"))  # Entries kept in process
+TRANSLATION_CACHE_TTL_SECONDS = int(os.getenv("TRANSLATION_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
+# Databases whose INSERT supports ON CONFLICT, so a batch can be stored with one upsert
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+TRANSLATION_MEMORY_KEY = ("source_hash", "target_language", "engine_version")
+
+def normalize_source_text(text: str) -> str:
+    """Collapse whitespace so trivially different inputs share one entry"""
+    return ' '.join(text.split())
+
+class TranslationMemory:
+    """Two-tier translation cache: an in-process LRU in front of a database table.
+
+    Entries are keyed by (normalized source text, target language, engine
+    version) and expire after ``ttl_seconds`` in both tiers.
+    """
+
+    def __init__(self, engine_version: str, max_entries: int = TRANSLATION_CACHE_SIZE,
+                 ttl_seconds: int = TRANSLATION_CACHE_TTL_SECONDS):
+        self.engine_version = engine_version
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.memory_hits = 0
+        self.database_hits = 0
+        self.misses = 0
+        # (text, language) -> (translated text, expiry as time.time())
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _source_hash(self, text: str) -> str:
+        return make_cache_key(text)
+
+    def _remember(self, key: Tuple[str, str], translated_text: str, age_seconds: float = 0.0):
+        self._entries[key] = (translated_text, time.time() + self.ttl_seconds - age_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_many(self, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        """Look up (normalized text, language) pairs, returning only the ones found"""
+        found = {}
+        missing = []
+        now = time.time()
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                entry = self._entries.get(key)
+                if entry and entry[1] > now:
+                    self._entries.move_to_end(key)
+                    found[key] = entry[0]
+                    self.memory_hits += 1
+                else:
+                    self._entries.pop(key, None)
+                    missing.append(key)
+        if not missing:
+            return found
+
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+        db = SessionLocal()
+        try:
+            rows = db.query(models.TranslationMemoryEntry).filter(
+                models.TranslationMemoryEntry.source_hash.in_({self._source_hash(text) for text, _ in missing}),
+                models.TranslationMemoryEntry.target_language.in_({language for _, language in missing}),
+                models.TranslationMemoryEntry.engine_version == self.engine_version,
+                models.TranslationMemoryEntry.created_at >= cutoff
+            ).all()
+        finally:
+            db.close()
+
+        stored = {(row.source_text, row.target_language): row for row in rows}
+        with self._lock:
+            for key in missing:
+                row = stored.get(key)
+                if row is None:
+                    self.misses += 1
+                    continue
+                found[key] = row.translated_text
+                self.database_hits += 1
+                created_at = row.created_at
+                if created_at.tzinfo is not None:
+                    created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+                self._remember(key, row.translated_text, (datetime.utcnow() - created_at).total_seconds())
+        return found
+
+    def put_many(self, translations: Dict[Tuple[str, str], str]):
+        """Store translations in both tiers, replacing older entries for the same key"""
+        if not translations:
+            return
+        created_at = datetime.utcnow()
+        rows = [
+            {
+                "source_hash": self._source_hash(text),
+                "source_text": text,
+                "target_language": language,
+                "engine_version": self.engine_version,
+                "translated_text": translated_text,
+                "created_at": created_at
+            }
+            for (text, language), translated_text in translations.items()
+        ]
+        db = SessionLocal()
+        try:
+            upsert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+            if upsert is not None:
+                # Rows stored concurrently by another worker are overwritten instead of failing the batch
+                statement = upsert(models.TranslationMemoryEntry.__table__)
+                statement = statement.on_conflict_do_update(
+                    index_elements=list(TRANSLATION_MEMORY_KEY),
+                    set_={column: statement.excluded[column] for column in ("source_text", "translated_text", "created_at")}
+                )
+                db.execute(statement, rows)
+            else:
+                for row in rows:
+                    self._put_row(db, row)
+            db.commit()
+        finally:
+            db.close()
+
+        with self._lock:
+            for key, translated_text in translations.items():
+                self._remember(key, translated_text)
+
+    def _put_row(self, db, row: Dict):
+        """Insert or update one entry in a savepoint, so a conflict only retries that row"""
+        key = [getattr(models.TranslationMemoryEntry, column) == row[column] for column in TRANSLATION_MEMORY_KEY]
+        values = {column: row[column] for column in ("source_text", "translated_text", "created_at")}
+        try:
+            with db.begin_nested():
+                if not db.query(models.TranslationMemoryEntry).filter(*key).update(values, synchronize_session=False):
+                    db.add(models.TranslationMemoryEntry(**row))
+        except IntegrityError:
+            # Another process inserted the same key in between
+            db.query(models.TranslationMemoryEntry).filter(*key).update(values, synchronize_session=False)
+
+    def invalidate(self, text: Optional[str] = None, language: Optional[str] = None) -> int:
+        """Drop entries for a source text and/or language, or everything; returns rows removed"""
+        if text is not None:
+            text = normalize_source_text(text)
+        with self._lock:
+            for key in list(self._entries):
+                if (text is None or key[0] == text) and (language is None or key[1] == language):
+                    del self._entries[key]
+
+        db = SessionLocal()
+        try:
+            query = db.query(models.TranslationMemoryEntry)
+            if text is not None:
+                query = query.filter(models.TranslationMemoryEntry.source_hash == self._source_hash(text))
+            if language is not None:
+                query = query.filter(models.TranslationMemoryEntry.target_language == language)
+            removed = query.delete(synchronize_session=False)
+            db.commit()
+            return removed
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, float]:
+        """Return per-tier hit counters and occupancy"""
+        db = SessionLocal()
+        try:
+            stored_entries = db.query(models.TranslationMemoryEntry).filter(
+                models.TranslationMemoryEntry.engine_version == self.engine_version
+            ).count()
+        finally:
+            db.close()
+
+        with self._lock:
+            lookups = self.memory_hits + self.database_hits + self.misses
+            return {
+                "engine_version": self.engine_version,
+                "memory_entries": len(self._entries),
+                "max_memory_entries": self.max_entries,
+                "stored_entries": stored_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "memory_hits": self.memory_hits,
+                "database_hits": self.database_hits,
+                "misses": self.misses,
+                "memory_hit_ratio": (self.memory_hits / lookups) if lookups else 0.0,
+                "hit_ratio": ((self.memory_hits + self.database_hits) / lookups) if lookups else 0.0
+            }
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Compare latency of the read endpoints on the sync and async session paths under concurrent load.
+
+Usage: python benchmark_async_endpoints.py [--requests 400] [--concurrency 32] [--rows 500]
+Uses a temporary SQLite database unless DATABASE_URL is set, in which case the
+benchmark rows are added to that database. Alongside the endpoint latencies the
+latency of GET / is sampled, which shows how long the event loop is blocked.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+from typing import List
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+temp_dir = None
+if "DATABASE_URL" not in os.environ:
+    temp_dir = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(temp_dir.name, 'bench.db')}"
+
+import httpx
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app import models, schemas, auth
+from app.database import Base, engine, async_engine, SessionLocal, get_db
+from app.main import app
+
+ENDPOINTS = ["/trains/station/NDLS", "/stations", "/announcement-templates", "/generated-announcements"]
+
+# The sync path as it was before the async port, registered under /sync for comparison
+
+@app.get("/sync/trains/station/{station_code}", response_model=List[schemas.Train])
+async def sync_trains_by_station(
+    station_code: str,
+    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(get_db)
+):
+    return db.query(models.Train).join(models.Station).filter(models.Station.station_code == station_code).all()
+
+@app.get("/sync/stations", response_model=List[schemas.StationMaster])
+async def sync_stations(current_user: models.User = Depends(auth.get_current_user), db: Session = Depends(get_db)):
+    return db.query(models.StationMaster).filter(models.StationMaster.is_active == True).all()
+
+@app.get("/sync/announcement-templates", response_model=List[schemas.AnnouncementTemplate])
+async def sync_templates(current_user: models.User = Depends(auth.get_current_user), db: Session = Depends(get_db)):
+    return db.query(models.AnnouncementTemplate).filter(models.AnnouncementTemplate.is_active == True).all()
+
+@app.get("/sync/generated-announcements", response_model=List[schemas.GeneratedAnnouncement])
+async def sync_generated(current_user: models.User = Depends(auth.get_current_user), db: Session = Depends(get_db)):
+    return db.query(models.GeneratedAnnouncement).filter(models.GeneratedAnnouncement.is_active == True).all()
+
+def seed(rows: int) -> str:
+    """Insert benchmark data and return a bearer token for it"""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = models.User(email=f"bench-{time.time_ns()}@example.com", username="bench",
+                           hashed_password="x", role="admin", station_code="ALL")
+        db.add(user)
+        db.flush()
+        for index in range(rows // 10):
+            db.add(models.StationMaster(station_name=f"Bench Station {time.time_ns()}",
+                                        station_code=f"B{time.time_ns() % 10 ** 8}"))
+            train = models.Train(train_number=f"B{time.time_ns() % 10 ** 8}", train_name=f"Bench Express {index}",
+                                 start_station="New Delhi", end_station="Mumbai Central")
+            train.stations = [
+                models.Station(station_name="New Delhi", station_code="NDLS", platform_number="1", sequence_order=1),
+                models.Station(station_name="Mumbai Central", station_code="MMCT", platform_number="3", sequence_order=2)
+            ]
+            db.add(train)
+            template = models.AnnouncementTemplate(title=f"Bench {index}", category="arrival",
+                                                   template_text="Train {train_number} arrives", created_by=user.id)
+            template.placeholders = [models.TemplatePlaceholder(placeholder_name="train_number", placeholder_type="text")]
+            db.add(template)
+            db.flush()
+            for _ in range(10):
+                db.add(models.GeneratedAnnouncement(
+                    template_id=template.id, title="Benchmark", final_text="Train 12951 arrives",
+                    placeholder_values="{}", created_by=user.id, station_code="NDLS"
+                ))
+        db.commit()
+        return auth.create_access_token({"sub": user.email})
+    finally:
+        db.close()
+
+async def measure(client: httpx.AsyncClient, paths, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, probes = [], []
+    done = asyncio.Event()
+
+    async def call(path):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/")
+            probes.append(time.perf_counter() - start)
+            await asyncio.sleep(0.005)
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(call(paths[index % len(paths)]) for index in range(requests)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+    return {'elapsed': elapsed, 'latencies': latencies, 'probes': probes}
+
+def percentile(values, fraction: float) -> float:
+    values = sorted(values) or [0.0]
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def summarize(name: str, results: dict, requests: int):
+    latencies, probes = results['latencies'], results['probes']
+    print(f"{name:<6} req/s={requests / results['elapsed']:8.1f}  p50={statistics.median(latencies) * 1000:7.2f}ms  "
+          f"p95={percentile(latencies, 0.95) * 1000:7.2f}ms  "
+          f"GET / p50={statistics.median(probes or [0.0]) * 1000:6.2f}ms  p95={percentile(probes, 0.95) * 1000:6.2f}ms")
+
+async def run(args):
+    token = seed(args.rows)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                 headers={"Authorization": f"Bearer {token}"}) as client:
+        print(f"Benchmarking {args.requests} requests at concurrency {args.concurrency} "
+              f"against {engine.url.render_as_string(hide_password=True)}")
+        # Warm both connection pools before measuring
+        await measure(client, ENDPOINTS + [f"/sync{path}" for path in ENDPOINTS], 16, 8)
+        for name, prefix in (('sync', '/sync'), ('async', '')):
+            summarize(name, await measure(client, [f"{prefix}{path}" for path in ENDPOINTS],
+                                          args.requests, args.concurrency), args.requests)
+    await async_engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--rows', type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
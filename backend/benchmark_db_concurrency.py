@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Measure SQLite read throughput while writes are in progress, default vs tuned pragmas.
+
+Usage: python benchmark_db_concurrency.py [--seconds 5] [--readers 8] [--writers 2]
+Runs against a temporary database file, so the application database is not touched.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+import statistics
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base, set_sqlite_pragmas
+
+def make_engine(path: str, tuned: bool):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    if tuned:
+        event.listen(engine, "connect", set_sqlite_pragmas)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+def seed(Session, rows: int):
+    db = Session()
+    try:
+        user = models.User(email="bench@example.com", username="bench", hashed_password="x", role="admin")
+        template = models.AnnouncementTemplate(title="Arrival", category="arrival",
+                                               template_text="Train {train_number} arrives", creator=user)
+        db.add_all([user, template])
+        db.flush()
+        for index in range(rows):
+            db.add(models.GeneratedAnnouncement(
+                template_id=template.id, title=f"Announcement {index}", final_text=f"Train {index} arrives",
+                placeholder_values="{}", created_by=user.id, station_code="NDLS"
+            ))
+        db.commit()
+        return user.id, template.id
+    finally:
+        db.close()
+
+def run(engine, seconds: float, readers: int, writers: int, user_id: int, template_id: int) -> dict:
+    Session = sessionmaker(bind=engine)
+    stop = threading.Event()
+    lock = threading.Lock()
+    results = {'reads': 0, 'writes': 0, 'errors': 0, 'latencies': []}
+
+    def reader():
+        latencies = []
+        reads = errors = 0
+        while not stop.is_set():
+            db = Session()
+            start = time.perf_counter()
+            try:
+                db.query(models.GeneratedAnnouncement).filter(
+                    models.GeneratedAnnouncement.station_code == "NDLS",
+                    models.GeneratedAnnouncement.is_active == True
+                ).order_by(models.GeneratedAnnouncement.id.desc()).limit(50).all()
+                reads += 1
+                latencies.append(time.perf_counter() - start)
+            except OperationalError:
+                errors += 1
+            finally:
+                db.close()
+        with lock:
+            results['reads'] += reads
+            results['errors'] += errors
+            results['latencies'].extend(latencies)
+
+    def writer():
+        writes = errors = 0
+        while not stop.is_set():
+            db = Session()
+            try:
+                # One generated announcement per transaction, as /announcements/generate does
+                db.add(models.GeneratedAnnouncement(
+                    template_id=template_id, title="Benchmark", final_text="Train 12951 arrives",
+                    placeholder_values="{}", created_by=user_id, station_code="NDLS"
+                ))
+                db.commit()
+                writes += 1
+            except OperationalError:
+                db.rollback()
+                errors += 1
+            finally:
+                db.close()
+        with lock:
+            results['writes'] += writes
+            results['errors'] += errors
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return results
+
+def summarize(name: str, results: dict, seconds: float):
+    latencies = sorted(results['latencies']) or [0.0]
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+    print(f"{name:<8} reads/s={results['reads'] / seconds:9.1f}  writes/s={results['writes'] / seconds:8.1f}  "
+          f"read p50={statistics.median(latencies) * 1000:6.2f}ms  p95={p95 * 1000:6.2f}ms  "
+          f"locked errors={results['errors']}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--rows', type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"Benchmarking {args.readers} readers and {args.writers} writers for {args.seconds}s per mode")
+    for name, tuned in (('default', False), ('tuned', True)):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            engine = make_engine(os.path.join(temp_dir, 'bench.db'), tuned)
+            user_id, template_id = seed(sessionmaker(bind=engine), args.rows)
+            summarize(name, run(engine, args.seconds, args.readers, args.writers, user_id, template_id), args.seconds)
+            engine.dispose()
+
+if __name__ == "__main__":
+    main()
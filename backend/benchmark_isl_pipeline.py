@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Compare the legacy three-step ISL FFmpeg pipeline with the single-pass one.
+
+Usage: python benchmark_isl_pipeline.py [--text "..."] [--runs 5]
+Run from the backend directory so the sample dataset in static/isl_dataset is found.
+"""
+
+import os
+import sys
+import time
+import uuid
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.isl_video_generator import ISLVideoGenerator
+
+DEFAULT_TEXT = "Attention please! Train number 12951 will arrive at platform number 5. Thank you."
+
+def make_audio_tracks(temp_dir: str, seconds: int) -> dict:
+    """Create one tone per announcement language to stand in for TTS output"""
+    audio_files = {}
+    for index, language in enumerate(['english', 'hindi', 'marathi', 'gujarati']):
+        path = os.path.join(temp_dir, f"{language}.mp3")
+        subprocess.run([
+            'ffmpeg', '-f', 'lavfi', '-i', f'sine=frequency={440 + index * 110}:duration={seconds}',
+            '-c:a', 'libmp3lame', '-y', path
+        ], capture_output=True, check=True)
+        audio_files[language] = path
+    return audio_files
+
+def legacy_pipeline(file_list_path: str, audio_files: dict, output_path: str):
+    """The previous implementation: concat, amix and mux as three FFmpeg runs through /tmp"""
+    temp_video = f"/tmp/temp_video_{uuid.uuid4().hex[:8]}.mp4"
+    merged_audio = f"/tmp/merged_audio_{uuid.uuid4().hex[:8]}.aac"
+    try:
+        subprocess.run([
+            'ffmpeg', '-f', 'concat', '-safe', '0', '-i', file_list_path, '-c', 'copy', '-y', temp_video
+        ], capture_output=True, check=True, timeout=60)
+
+        audio_inputs = []
+        for audio_path in audio_files.values():
+            audio_inputs.extend(['-i', audio_path])
+        audio_filters = ''.join(f'[{i}:a]' for i in range(len(audio_files)))
+        subprocess.run(['ffmpeg'] + audio_inputs + [
+            '-filter_complex', f'{audio_filters}amix=inputs={len(audio_files)}:duration=longest[aout]',
+            '-map', '[aout]', '-c:a', 'aac', '-b:a', '192k', '-y', merged_audio
+        ], capture_output=True, check=True, timeout=60)
+
+        subprocess.run([
+            'ffmpeg', '-i', temp_video, '-i', merged_audio, '-c:v', 'copy', '-c:a', 'aac',
+            '-b:a', '192k', '-shortest', '-y', output_path
+        ], capture_output=True, check=True, timeout=60)
+    finally:
+        for path in (temp_video, merged_audio):
+            if os.path.exists(path):
+                os.unlink(path)
+
+def summarize(name: str, samples: list):
+    print(f"{name:<12} mean={statistics.mean(samples) * 1000:8.1f}ms  "
+          f"min={min(samples) * 1000:8.1f}ms  max={max(samples) * 1000:8.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--text', default=DEFAULT_TEXT)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--dataset', default='static/isl_dataset')
+    parser.add_argument('--audio-seconds', type=int, default=8)
+    args = parser.parse_args()
+
+    generator = ISLVideoGenerator(args.dataset)
+    video_paths = generator._find_matching_videos(generator._extract_words_improved(args.text))
+    if not video_paths:
+        print("❌ No matching ISL videos found in the dataset")
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        audio_files = make_audio_tracks(temp_dir, args.audio_seconds)
+        file_list_path = os.path.join(temp_dir, 'files.txt')
+        with open(file_list_path, 'w') as f:
+            for video_path in video_paths:
+                f.write(f"file '{os.path.abspath(video_path)}'\n")
+
+        print(f"Benchmarking {len(video_paths)} clips with {len(audio_files)} audio tracks, {args.runs} runs each")
+
+        legacy_samples = []
+        single_pass_samples = []
+        stage_samples = {}
+        for run in range(args.runs):
+            output_path = os.path.join(temp_dir, f'legacy_{run}.mp4')
+            start_time = time.perf_counter()
+            legacy_pipeline(file_list_path, audio_files, output_path)
+            legacy_samples.append(time.perf_counter() - start_time)
+
+            output_path = os.path.join(temp_dir, f'single_{run}.mp4')
+            timings = {}
+            start_time = time.perf_counter()
+            if not generator._build_ffmpeg_command_with_audio(file_list_path, audio_files, output_path, timings):
+                print("❌ Single-pass pipeline failed")
+                return
+            single_pass_samples.append(time.perf_counter() - start_time)
+            for stage, seconds in timings.items():
+                stage_samples.setdefault(stage, []).append(seconds)
+
+        summarize('legacy', legacy_samples)
+        summarize('single-pass', single_pass_samples)
+        for stage, samples in stage_samples.items():
+            summarize(f'  {stage}', samples)
+        print(f"Speedup: {statistics.mean(legacy_samples) / statistics.mean(single_pass_samples):.2f}x")
+
+if __name__ == "__main__":
+    main()
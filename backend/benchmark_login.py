@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Measure login throughput and event loop stalls with bcrypt inline vs on the password pool.
+
+Usage: python benchmark_login.py [--logins 32] [--concurrency 16]
+Uses a temporary SQLite database unless DATABASE_URL is set. Alongside the
+logins the event loop lag is sampled: how late a 10 ms timer fires. With bcrypt
+running inline every password check stalls the loop, and every other request
+with it.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+temp_dir = None
+if "DATABASE_URL" not in os.environ:
+    temp_dir = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(temp_dir.name, 'bench.db')}"
+
+import httpx
+from fastapi import Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app import models, schemas, auth, executors
+from app.database import Base, engine, SessionLocal, get_db
+from app.main import app
+
+BENCH_EMAIL = "login-bench@example.com"
+BENCH_PASSWORD = "login-bench-password"
+
+# The login path as it was before bcrypt moved to the password pool
+@app.post("/bench/inline-login")
+async def inline_login(user_credentials: schemas.UserLogin, db: Session = Depends(get_db)):
+    user = auth.authenticate_user(db, user_credentials.email, user_credentials.password)
+    if not user:
+        raise HTTPException(status_code=401, detail="Incorrect email or password")
+    return {"access_token": auth.create_access_token(data={"sub": user.email})}
+
+def seed():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if db.query(models.User).filter(models.User.email == BENCH_EMAIL).first() is None:
+            db.add(models.User(email=BENCH_EMAIL, username="login-bench", role="admin",
+                               hashed_password=auth.get_password_hash(BENCH_PASSWORD)))
+            db.commit()
+    finally:
+        db.close()
+
+def percentile(values, fraction: float) -> float:
+    values = sorted(values) or [0.0]
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+async def measure(client: httpx.AsyncClient, path: str, logins: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    body = {"email": BENCH_EMAIL, "password": BENCH_PASSWORD, "role": "admin"}
+    latencies, lags = [], []
+    done = asyncio.Event()
+
+    async def login():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(path, json=body)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - start - 0.01)
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+    return {'elapsed': elapsed, 'latencies': latencies, 'lags': lags}
+
+def summarize(name: str, results: dict, logins: int):
+    latencies, lags = results['latencies'], results['lags']
+    print(f"{name:<7} logins/s={logins / results['elapsed']:7.1f}  login p50={statistics.median(latencies) * 1000:8.1f}ms  "
+          f"p95={percentile(latencies, 0.95) * 1000:8.1f}ms  loop lag p50={statistics.median(lags or [0.0]) * 1000:7.1f}ms  "
+          f"p95={percentile(lags, 0.95) * 1000:7.1f}ms  max={max(lags or [0.0]) * 1000:7.1f}ms")
+
+async def run(args):
+    seed()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        print(f"Benchmarking {args.logins} logins at concurrency {args.concurrency} "
+              f"({executors.PASSWORD_HASH_WORKERS} password workers)")
+        # Warm the connection and worker pools before measuring
+        await measure(client, "/auth/login", 4, 4)
+        for name, path in (('inline', '/bench/inline-login'), ('pool', '/auth/login')):
+            summarize(name, await measure(client, path, args.logins, args.concurrency), args.logins)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--logins', type=int, default=32)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    executors.shutdown()
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
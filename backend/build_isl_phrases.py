@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import engine
+from app import models
+from app.jobs import run_isl_phrases_job
+
+def main():
+    """Precompose frequent ISL phrases from the announcement history"""
+    models.Base.metadata.create_all(bind=engine)
+    stats = run_isl_phrases_job({}, lambda percent, message: print(f"[{percent}%] {message}"))
+    print(f"🎉 Mined {stats['mined']} phrases: {stats['rendered']} rendered, "
+          f"{stats['reused']} reused, {stats['skipped']} skipped")
+    return stats
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Check that the train listings don't run a query per train.
+
+Usage: python check_query_counts.py [--trains 10 1000]
+Runs against a temporary SQLite database and exits with status 1 if a train is
+listed twice or the query count of an endpoint grows with the number of trains.
+selectinload fetches stations for up to 500 trains per query, so one query per
+500 trains is expected and not counted as growth.
+"""
+
+import os
+import sys
+import argparse
+import math
+import tempfile
+from collections import Counter
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+temp_dir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(temp_dir.name, 'queries.db')}"
+# The app serves its static directory, which is resolved from the working directory
+os.makedirs(os.path.join(temp_dir.name, "static"), exist_ok=True)
+os.chdir(temp_dir.name)
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import models, auth
+from app.database import Base, engine, async_engine, SessionLocal
+from app.main import app
+from app.pagination import PAGE_SIZE_MAX
+
+# /trains is paged, so it is checked with the largest page
+ENDPOINTS = [f"/trains?limit={PAGE_SIZE_MAX}", "/trains/station/NDLS", "/trains/station/ALL"]
+
+# Parent rows per SELECT ... IN query issued by selectinload
+SELECTIN_BATCH_SIZE = 500
+
+class QueryCounter:
+    """Count statements executed through both the sync and async engines"""
+
+    def __init__(self):
+        self.count = 0
+        for target in (engine, async_engine.sync_engine):
+            event.listen(target, "before_cursor_execute", self._increment)
+
+    def _increment(self, *args):
+        self.count += 1
+
+def add_trains(count: int, start: int):
+    db = SessionLocal()
+    try:
+        for number in range(start, start + count):
+            train = models.Train(train_number=str(10000 + number), train_name=f"Express {number}",
+                                 start_station="New Delhi", end_station="Mumbai Central")
+            # Ring railways pass the same station twice, which a plain join would list twice
+            train.stations = [
+                models.Station(station_name="New Delhi", station_code="NDLS", platform_number="1", sequence_order=1),
+                models.Station(station_name="Mumbai Central", station_code="MMCT", platform_number="3", sequence_order=2),
+                models.Station(station_name="New Delhi", station_code="NDLS", platform_number="2", sequence_order=3)
+            ]
+            db.add(train)
+        db.commit()
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--trains', type=int, nargs='+', default=[10, 1000])
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(models.User(email="queries@example.com", username="queries", hashed_password="x", role="admin"))
+    db.commit()
+    db.close()
+    headers = {"Authorization": f"Bearer {auth.create_access_token({'sub': 'queries@example.com'})}"}
+
+    client = TestClient(app)
+    # Authenticate once so the cached user lookup isn't counted against the first endpoint
+    client.get("/auth/me", headers=headers).raise_for_status()
+    counter = QueryCounter()
+    counts = {path: [] for path in ENDPOINTS}
+    failed = False
+    total = 0
+    for size in sorted(args.trains):
+        add_trains(size - total, total)
+        total = size
+        for path in ENDPOINTS:
+            counter.count = 0
+            response = client.get(path, headers=headers)
+            response.raise_for_status()
+            paged = path.startswith("/trains?")
+            expected = min(size, PAGE_SIZE_MAX) if paged else size
+            # Pages fetch one look-ahead row, whose stations are loaded too
+            loaded = min(size, PAGE_SIZE_MAX + 1) if paged else size
+            counts[path].append(counter.count - math.ceil(loaded / SELECTIN_BATCH_SIZE))
+            duplicates = [number for number, seen in Counter(train['train_number'] for train in response.json()).items()
+                          if seen > 1]
+            if len(response.json()) != expected or duplicates:
+                print(f"❌ {path} returned {len(response.json())} trains for {expected} ({len(duplicates)} duplicated)")
+                failed = True
+
+    for path, path_counts in counts.items():
+        sizes = ", ".join(f"{size} trains: {count}" for size, count in zip(sorted(args.trains), path_counts))
+        if len(set(path_counts)) == 1:
+            print(f"✅ {path} runs {path_counts[0]} queries plus one per {SELECTIN_BATCH_SIZE} trains ({sizes})")
+        else:
+            print(f"❌ {path} query count grows with the number of trains ({sizes})")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Check with EXPLAIN that the hot list and lookup queries use indexes instead of table scans.
+
+Usage: python check_query_plans.py
+Uses a temporary SQLite database unless DATABASE_URL is set, in which case the
+configured database is checked after applying pending migrations. Exits with
+status 1 if any query falls back to a full table scan.
+"""
+
+import os
+import sys
+import tempfile
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+temp_dir = None
+if "DATABASE_URL" not in os.environ:
+    temp_dir = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(temp_dir.name, 'plans.db')}"
+
+from sqlalchemy import select, text
+
+from app import models
+from app.database import Base, engine, IS_SQLITE
+from app.migrations import run_pending_migrations
+from app.pagination import encode_cursor, paginate
+
+# The query shapes issued by main.py, with representative parameter values
+HOT_QUERIES = [
+    ("trains at a station", select(models.Train).filter(
+        models.Train.id.in_(select(models.Station.train_id).filter(models.Station.station_code == "NDLS"))
+    )),
+    ("stations of listed trains", select(models.Station).filter(models.Station.train_id.in_([1, 2, 3]))),
+    ("active stations", select(models.StationMaster).filter(models.StationMaster.is_active == True)),
+    ("active templates", select(models.AnnouncementTemplate).filter(models.AnnouncementTemplate.is_active == True)),
+    ("placeholders of listed templates", select(models.TemplatePlaceholder).filter(
+        models.TemplatePlaceholder.template_id.in_([1, 2, 3])
+    )),
+    ("active generated announcements", select(models.GeneratedAnnouncement).filter(
+        models.GeneratedAnnouncement.is_active == True
+    )),
+    ("generated announcements of a station", select(models.GeneratedAnnouncement).filter(
+        models.GeneratedAnnouncement.is_active == True,
+        models.GeneratedAnnouncement.station_code == "NDLS"
+    )),
+    ("page of announcement history", paginate(
+        select(models.GeneratedAnnouncement).filter(models.GeneratedAnnouncement.is_active == True),
+        models.GeneratedAnnouncement, 50, encode_cursor(100),
+        sort_column=models.GeneratedAnnouncement.created_at, newest_first=True
+    )),
+    ("page of active stations", paginate(
+        select(models.StationMaster).filter(models.StationMaster.is_active == True),
+        models.StationMaster, 50, encode_cursor(100)
+    )),
+    ("active audio files", select(models.AudioFile).filter(models.AudioFile.is_active == True)),
+    ("active multi-language audio", select(models.MultiLanguageAudioFile).filter(
+        models.MultiLanguageAudioFile.is_active == True
+    )),
+    ("multi-language audio version", select(models.MultiLanguageAudioVersion).filter(
+        models.MultiLanguageAudioVersion.parent_audio_id == 1,
+        models.MultiLanguageAudioVersion.language_code == "hi",
+        models.MultiLanguageAudioVersion.is_active == True
+    )),
+]
+
+def explain(connection, statement) -> list:
+    sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    if IS_SQLITE:
+        return [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+    return [row[0] for row in connection.execute(text(f"EXPLAIN {sql}"))]
+
+def is_table_scan(plan_line: str) -> bool:
+    if IS_SQLITE:
+        # "SCAN table" reads every row; "SCAN table USING ... INDEX" walks an index instead
+        return plan_line.startswith("SCAN ") and " USING " not in plan_line
+    return "Seq Scan" in plan_line
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    run_pending_migrations(engine)
+
+    failed = False
+    with engine.connect() as connection:
+        if not IS_SQLITE:
+            # Small tables are cheaper to scan, so only fall back to a scan when no index applies
+            connection.execute(text("SET enable_seqscan = off"))
+        for name, statement in HOT_QUERIES:
+            plan = explain(connection, statement)
+            scans = [line for line in plan if is_table_scan(line.strip())]
+            if scans:
+                failed = True
+                print(f"❌ {name}: {'; '.join(line.strip() for line in scans)}")
+            else:
+                print(f"✅ {name}: {'; '.join(line.strip() for line in plan)}")
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import argparse
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.isl_video_generator import isl_generator
+from app.isl_normalizer import normalize_dataset, PROFILE_ID, CANONICAL_PROFILE
+
+def main():
+    """Transcode the ISL dataset to the canonical clip profile"""
+    parser = argparse.ArgumentParser(description="Normalize ISL dataset clips so concat can always stream-copy")
+    parser.add_argument('--force', action='store_true', help="Re-encode clips that are already normalized")
+    parser.add_argument('--workers', type=int, default=2, help="Number of concurrent FFmpeg processes")
+    args = parser.parse_args()
+
+    print(f"🚀 Normalizing ISL dataset at {isl_generator.dataset_path}")
+    print(f"Profile {PROFILE_ID}: {CANONICAL_PROFILE}")
+    stats = normalize_dataset(isl_generator.dataset_index, force=args.force, workers=args.workers)
+
+    if isl_generator.dataset_index.fully_normalized:
+        print("🎉 Every clip is normalized; ISL videos will use the normalized copies")
+    else:
+        print("⚠️  Some clips are not normalized yet; ISL videos keep using the original clips")
+    return stats
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import argparse
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import engine
+from app import models
+from app.jobs import run_audio_library_job
+
+def main():
+    """Pre-render number and station name clips for announcement audio"""
+    parser = argparse.ArgumentParser(description="Pre-render the number and station name audio library")
+    parser.add_argument('--languages', help="Comma-separated language codes (default: every supported language)")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    payload = {}
+    if args.languages:
+        payload['languages'] = [code.strip() for code in args.languages.split(',') if code.strip()]
+    stats = run_audio_library_job(payload, lambda percent, message: print(f"[{percent}%] {message}"))
+    print(f"🎉 {stats['rendered']} clips rendered, {stats['existing']} already present, {stats['failed']} failed")
+    return stats
+
+if __name__ == "__main__":
+    main()
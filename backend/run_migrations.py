@@ -57,6 +57,20 @@ def run_migrations():
     except Exception as e:
         print(f"❌ Error running template announcements migration: {e}")
     
+    print("\n" + "=" * 50)
+    
+    # Run versioned migrations tracked in the schema_migrations table
+    try:
+        from app.migrations import run_pending_migrations
+        print("\n📋 Migration 5: Applying versioned schema migrations")
+        applied = run_pending_migrations()
+        if not applied:
+            print("✅ Schema is up to date")
+    except ImportError as e:
+        print(f"❌ Error importing versioned migrations: {e}")
+    except Exception as e:
+        print(f"❌ Error running versioned migrations: {e}")
+    
     print("\n" + "=" * 50)
     print("🎉 All migrations completed!")
 
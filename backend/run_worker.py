@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import engine
+from app.models import Base
+from app.jobs import JobWorker
+
+if __name__ == "__main__":
+    # Run the API with JOB_WORKER_IN_PROCESS=false when using dedicated workers
+    Base.metadata.create_all(bind=engine)
+    worker = JobWorker()
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        worker.stop()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Regression tests for refresh token rotation and revocation.
+
+Usage: python -m pytest test_auth_refresh.py
+Runs the API against a temporary SQLite database.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+temp_dir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(temp_dir.name, 'refresh.db')}"
+os.environ["JOB_WORKER_IN_PROCESS"] = "false"
+# The app serves its static directory, which is resolved from the working directory
+os.makedirs(os.path.join(temp_dir.name, "static"), exist_ok=True)
+os.chdir(temp_dir.name)
+
+from fastapi.testclient import TestClient
+
+from app import models, auth
+from app.database import SessionLocal
+from app.main import app
+
+ADMIN_LOGIN = {"email": "admin@indianrail.gov.in", "password": "admin123", "role": "admin"}
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+def login(client) -> dict:
+    response = client.post("/auth/login", json=ADMIN_LOGIN)
+    response.raise_for_status()
+    return response.json()
+
+def refresh(client, refresh_token: str):
+    return client.post("/auth/refresh", json={"refresh_token": refresh_token})
+
+def test_rotated_refresh_token_is_rejected(client):
+    first = login(client)["refresh_token"]
+    response = refresh(client, first)
+    assert response.status_code == 200
+    second = response.json()["refresh_token"]
+    assert second != first
+
+    assert refresh(client, first).status_code == 401
+
+def test_reusing_a_rotated_token_revokes_the_session(client):
+    first = login(client)["refresh_token"]
+    second = refresh(client, first).json()["refresh_token"]
+
+    # The old token turning up again means it leaked, so its successor stops working too
+    assert refresh(client, first).status_code == 401
+    assert refresh(client, second).status_code == 401
+
+def test_deleting_a_user_revokes_their_refresh_tokens(client):
+    db = SessionLocal()
+    try:
+        user = models.User(email="refresh@example.com", username="refresh", role="operator",
+                           station_code="NDLS", hashed_password=auth.get_password_hash("secret123"))
+        db.add(user)
+        db.commit()
+        refresh_token = auth.create_refresh_token(db, user)
+        user_id = user.id
+    finally:
+        db.close()
+
+    headers = {"Authorization": f"Bearer {login(client)['access_token']}"}
+    client.delete(f"/auth/users/{user_id}", headers=headers).raise_for_status()
+
+    assert refresh(client, refresh_token).status_code == 401
+
+def test_access_token_is_not_a_refresh_token(client):
+    assert refresh(client, login(client)["access_token"]).status_code == 401
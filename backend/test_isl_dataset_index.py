@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Regression tests for the ISL dataset index and clip normalizer.
+
+Usage: python -m pytest test_isl_dataset_index.py
+Needs ffmpeg to generate and normalize the sample clips.
+"""
+
+import os
+import sys
+import shutil
+import subprocess
+
+import pytest
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.isl_dataset_index import ISLDatasetIndex
+from app.isl_normalizer import normalize_dataset, PROFILE_ID
+
+WORDS = ["attention", "platform", "train"]
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is required")
+
+def make_dataset(root: str) -> str:
+    dataset_path = os.path.join(root, "isl_dataset")
+    for word in WORDS:
+        os.makedirs(os.path.join(dataset_path, word))
+        subprocess.run([
+            'ffmpeg', '-v', 'error', '-f', 'lavfi', '-i', 'testsrc=size=320x240:rate=30:duration=0.2',
+            '-pix_fmt', 'yuv420p', '-y', os.path.join(dataset_path, word, f"{word}.mp4")
+        ], check=True)
+    return dataset_path
+
+def test_full_refresh_keeps_normalized_copies(tmp_path):
+    index = ISLDatasetIndex(make_dataset(str(tmp_path)), profile_id=PROFILE_ID)
+    assert normalize_dataset(index)['normalized'] == len(WORDS)
+    assert index.fully_normalized
+
+    index.refresh(full=True)
+
+    assert index.fully_normalized
+    for word in WORDS:
+        assert index.videos()[word].endswith(".normalized.mp4")
+    # Nothing is transcoded again
+    assert normalize_dataset(index)['normalized'] == 0
+
+def test_full_refresh_drops_copies_of_replaced_clips(tmp_path):
+    index = ISLDatasetIndex(make_dataset(str(tmp_path)), profile_id=PROFILE_ID)
+    normalize_dataset(index)
+
+    clip_path = index.get_entry("train")['path']
+    stat = os.stat(clip_path)
+    os.utime(clip_path, (stat.st_atime, stat.st_mtime + 10))
+    index.refresh(full=True)
+
+    assert not index.fully_normalized
+    assert index.videos()["train"] == clip_path
+
+def test_normalize_saves_index_once(tmp_path, monkeypatch):
+    index = ISLDatasetIndex(make_dataset(str(tmp_path)), profile_id=PROFILE_ID)
+    index.refresh()
+    saves = []
+    monkeypatch.setattr(index, "_save_sidecar", lambda: saves.append(1))
+
+    normalize_dataset(index)
+
+    assert len(saves) == 1
+    assert index.fully_normalized
@@ -122,6 +122,8 @@ interface GeneratedAnnouncement {
 export default function TemplateAnnouncementsPage() {
     const [templates, setTemplates] = useState<AnnouncementTemplate[]>([]);
     const [generatedAnnouncements, setGeneratedAnnouncements] = useState<GeneratedAnnouncement[]>([]);
+    const [nextAnnouncementsCursor, setNextAnnouncementsCursor] = useState<string | null>(null);
+    const [loadingMoreAnnouncements, setLoadingMoreAnnouncements] = useState(false);
     const [isTemplateDialogOpen, setIsTemplateDialogOpen] = useState(false);
     const [isGenerateDialogOpen, setIsGenerateDialogOpen] = useState(false);
     const [currentTemplate, setCurrentTemplate] = useState<AnnouncementTemplate | null>(null);
@@ -178,10 +180,14 @@ export default function TemplateAnnouncementsPage() {
         }
     };
 
-    // Fetch generated announcements from API
-    const fetchGeneratedAnnouncements = async () => {
+    // Fetch generated announcements from API, newest first a page at a time;
+    // pass the cursor of the next page to append older announcements
+    const fetchGeneratedAnnouncements = async (cursor?: string) => {
         try {
-            const response = await fetch('http://localhost:8000/generated-announcements', {
+            const url = cursor
+                ? `http://localhost:8000/generated-announcements?cursor=${encodeURIComponent(cursor)}`
+                : 'http://localhost:8000/generated-announcements';
+            const response = await fetch(url, {
                 headers: {
                     'Authorization': `Bearer ${token}`,
                     'Content-Type': 'application/json',
@@ -190,7 +196,8 @@ export default function TemplateAnnouncementsPage() {
 
             if (response.ok) {
                 const data = await response.json();
-                setGeneratedAnnouncements(data);
+                setGeneratedAnnouncements(prev => cursor ? [...prev, ...data] : data);
+                setNextAnnouncementsCursor(response.headers.get('X-Next-Cursor'));
             } else {
                 toast({
                     title: "Error",
@@ -207,6 +214,13 @@ export default function TemplateAnnouncementsPage() {
         }
     };
 
+    const loadMoreGeneratedAnnouncements = async () => {
+        if (!nextAnnouncementsCursor) return;
+        setLoadingMoreAnnouncements(true);
+        await fetchGeneratedAnnouncements(nextAnnouncementsCursor);
+        setLoadingMoreAnnouncements(false);
+    };
+
     useEffect(() => {
         fetchTemplates();
         fetchGeneratedAnnouncements();
@@ -748,6 +762,13 @@ export default function TemplateAnnouncementsPage() {
                                     </TableBody>
                                 </Table>
                             )}
+                            {nextAnnouncementsCursor && (
+                                <div className="flex justify-center pt-4">
+                                    <Button variant="outline" onClick={loadMoreGeneratedAnnouncements} disabled={loadingMoreAnnouncements}>
+                                        {loadingMoreAnnouncements ? 'Loading...' : 'Load older announcements'}
+                                    </Button>
+                                </div>
+                            )}
                         </CardContent>
                     </Card>
                 </TabsContent>
@@ -61,6 +61,8 @@ interface Train {
 
 export default function TrainsPage() {
     const [trains, setTrains] = useState<Train[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [loading, setLoading] = useState(true);
     const [selectedTrain, setSelectedTrain] = useState<Train | null>(null);
     const { user } = useAuth();
@@ -90,10 +92,14 @@ export default function TrainsPage() {
         fetchTrains();
     }, []);
 
-    const fetchTrains = async () => {
+    // The API returns trains a page at a time; pass the cursor of the next page to append it
+    const fetchTrains = async (cursor?: string) => {
         try {
             const token = localStorage.getItem('accessToken');
-            const response = await fetch('http://localhost:8000/trains', {
+            const url = cursor
+                ? `http://localhost:8000/trains?cursor=${encodeURIComponent(cursor)}`
+                : 'http://localhost:8000/trains';
+            const response = await fetch(url, {
                 headers: {
                     'Authorization': `Bearer ${token}`,
                 },
@@ -101,7 +107,8 @@ export default function TrainsPage() {
 
             if (response.ok) {
                 const data = await response.json();
-                setTrains(data);
+                setTrains(prev => cursor ? [...prev, ...data] : data);
+                setNextCursor(response.headers.get('X-Next-Cursor'));
             } else {
                 toast({
                     title: "Error",
@@ -120,6 +127,13 @@ export default function TrainsPage() {
         }
     };
 
+    const loadMoreTrains = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        await fetchTrains(nextCursor);
+        setLoadingMore(false);
+    };
+
     const deleteTrain = async (trainId: number) => {
         if (!confirm('Are you sure you want to delete this train?')) {
             return;
@@ -350,7 +364,7 @@ export default function TrainsPage() {
                                     Enter train details and add all stations along the route.
                                 </DialogDescription>
                             </DialogHeader>
-                            <AddTrainForm onSuccess={fetchTrains} />
+                            <AddTrainForm onSuccess={() => fetchTrains()} />
                         </DialogContent>
                     </Dialog>
                 </div>
@@ -454,6 +468,13 @@ export default function TrainsPage() {
                             </TableBody>
                         </Table>
                     )}
+                    {nextCursor && (
+                        <div className="flex justify-center pt-4">
+                            <Button variant="outline" onClick={loadMoreTrains} disabled={loadingMore}>
+                                {loadingMore ? 'Loading...' : 'Load more trains'}
+                            </Button>
+                        </div>
+                    )}
                 </CardContent>
             </Card>
         </div>